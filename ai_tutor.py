@@ -1,9 +1,14 @@
 # AI Tutor - GPT-4o-mini and Llama 3.2 Comparison Tool
 
+import asyncio
+import sys
+from operator import attrgetter
+import httpx
 from dotenv import load_dotenv
 from IPython.display import Markdown, display, update_display
-from openai import OpenAI
-import ollama
+from openai import AsyncOpenAI, RateLimitError
+from ollama import AsyncClient
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 # Load environment variables
 load_dotenv()
@@ -11,85 +16,220 @@ load_dotenv()
 # Constants
 MODEL_GPT = 'gpt-4o-mini'
 MODEL_LLAMA = 'llama3.2'
+STREAM_FLUSH_CHUNKS = 16  # Write streamed output every N chunks (or on newline)
+MAX_CONCURRENT_COMPARISONS = 10  # Keeps compare_many under the OpenAI rate limits
+SYSTEM_PROMPT = "You are a helpful technical tutor who answers questions about python code, software engineering, data science and LLMs"
 
-# Set up environment
-openai = OpenAI()
+# Shared system message so every request starts with an identical prefix,
+# which is what OpenAI's automatic prompt caching keys on
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
 
-def ask_question_gpt(question, system_prompt=None, user_prompt=None):
+# Async clients (so both models can be queried concurrently), created by
+# _get_clients. Pooled connections belong to the event loop that opened them,
+# so the clients are shared by every request within one loop (one
+# asyncio.run call, or a notebook's loop) and recreated for a new loop.
+_clients = None  # (event loop, OpenAI client, Ollama client)
+
+def _get_clients():
+    """
+    Return the (OpenAI, Ollama) clients for the running event loop
+    
+    One pooled HTTP/2 connection is kept alive and shared by every request in
+    the loop, so only the first call pays for the TCP/TLS handshake.
+    """
+    global _clients
+    loop = asyncio.get_running_loop()
+    if _clients is None or _clients[0] is not loop:
+        aclient = AsyncOpenAI(
+            http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+        _clients = (loop, aclient, AsyncClient())
+    return _clients[1], _clients[2]
+
+# Bound once so the per-token loop does a single lookup for a chunk's choices
+_get_choices = attrgetter('choices')
+
+def _print_response(title, response):
+    """
+    Print a complete model response with the same framing used while streaming
+    """
+    print(f"{title} Response:")
+    print("=" * 50)
+    print(response)
+    print("=" * 50)
+
+def _flush_stream(buffer):
+    """
+    Write buffered stream chunks to stdout in a single call
+    """
+    sys.stdout.write(''.join(buffer))
+    sys.stdout.flush()
+    buffer.clear()
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=wait_random_exponential(min=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+async def _create_gpt_stream(messages):
+    """
+    Start a streaming GPT request, backing off and retrying on rate limits
+    """
+    aclient, _ = _get_clients()
+    return await aclient.chat.completions.create(
+        model=MODEL_GPT,
+        messages=messages,
+        stream=True
+    )
+
+async def ask_question_gpt(question, system_prompt=None, user_prompt=None, stream_output=True):
     """
     Ask a question using GPT-4o-mini with streaming response
     """
     if system_prompt is None:
-        system_prompt = "You are a helpful technical tutor who answers questions about python code, software engineering, data science and LLMs"
+        system_message = _SYSTEM_MSG
+    else:
+        system_message = {"role": "system", "content": system_prompt}
     
     if user_prompt is None:
         user_prompt = "Please give a detailed explanation to the following question: " + question
     
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt}
-    ]
-    
-    print("GPT-4o-mini Response:")
-    print("=" * 50)
-    
-    stream = openai.chat.completions.create(
-        model=MODEL_GPT, 
-        messages=messages, 
-        stream=True
-    )
-    
-    response = ""
-    for chunk in stream:
-        content = chunk.choices[0].delta.content or ''
-        response += content
-        print(content, end='', flush=True)
-    
-    print("\n" + "=" * 50)
-    return response
+    messages = [system_message, {"role": "user", "content": user_prompt}]
+    
+    if stream_output:
+        print("GPT-4o-mini Response:")
+        print("=" * 50)
+    
+    stream = await _create_gpt_stream(messages)
+    
+    parts = []
+    buffer = []
+    async for chunk in stream:
+        choices = _get_choices(chunk)
+        content = choices[0].delta.content if choices else None
+        if not content:
+            continue
+        parts.append(content)
+        if stream_output:
+            buffer.append(content)
+            if '\n' in content or len(buffer) >= STREAM_FLUSH_CHUNKS:
+                _flush_stream(buffer)
+    
+    if stream_output:
+        _flush_stream(buffer)
+        print("\n" + "=" * 50)
+    return ''.join(parts)
 
-def ask_question_llama(question, system_prompt=None, user_prompt=None):
+async def ask_question_llama(question, system_prompt=None, user_prompt=None, stream_output=True):
     """
-    Ask a question using Llama 3.2
+    Ask a question using Llama 3.2 with streaming response
     """
     if system_prompt is None:
-        system_prompt = "You are a helpful technical tutor who answers questions about python code, software engineering, data science and LLMs"
+        system_message = _SYSTEM_MSG
+    else:
+        system_message = {"role": "system", "content": system_prompt}
     
     if user_prompt is None:
         user_prompt = "Please give a detailed explanation to the following question: " + question
     
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt}
-    ]
+    messages = [system_message, {"role": "user", "content": user_prompt}]
     
-    print("Llama 3.2 Response:")
-    print("=" * 50)
+    if stream_output:
+        print("Llama 3.2 Response:")
+        print("=" * 50)
     
-    response = ollama.chat(model=MODEL_LLAMA, messages=messages)
-    reply = response['message']['content']
+    _, ollama_client = _get_clients()
+    stream = await ollama_client.chat(
+        model=MODEL_LLAMA,
+        messages=messages,
+        stream=True
+    )
     
-    print(reply)
-    print("=" * 50)
-    return reply
+    parts = []
+    buffer = []
+    async for chunk in stream:
+        content = chunk['message']['content']
+        if not content:
+            continue
+        parts.append(content)
+        if stream_output:
+            buffer.append(content)
+            if '\n' in content or len(buffer) >= STREAM_FLUSH_CHUNKS:
+                _flush_stream(buffer)
+    
+    if stream_output:
+        _flush_stream(buffer)
+        print("\n" + "=" * 50)
+    return ''.join(parts)
 
-def compare_ai_models(question):
+async def compare_ai_models(question):
     """
     Compare responses from both GPT-4o-mini and Llama 3.2
+    
+    Both models are queried concurrently, so the total wait is the slower of
+    the two rather than their sum. GPT's answer streams live while Llama runs
+    in the background; Llama's answer is printed as soon as GPT is done and
+    it has finished, so the two outputs never interleave on the terminal.
     """
     print(f"Question: {question}")
     print("\n" + "=" * 80)
     
-    # Get GPT response
-    gpt_response = ask_question_gpt(question)
+    llama_task = asyncio.create_task(ask_question_llama(question, stream_output=False))
+    try:
+        # Show GPT response as it streams
+        gpt_response = await ask_question_gpt(question)
+    except BaseException:
+        llama_task.cancel()
+        raise
     
     print("\n" + "=" * 80)
     
-    # Get Llama response
-    llama_response = ask_question_llama(question)
+    # Show Llama response
+    if not llama_task.done():
+        print("Waiting for Llama 3.2...")
+    llama_response = await llama_task
+    _print_response("Llama 3.2", llama_response)
     
     return gpt_response, llama_response
 
+async def _ask_both(semaphore, question):
+    """
+    Get both models' complete responses once a slot in the semaphore is free
+    """
+    async with semaphore:
+        return await asyncio.gather(
+            ask_question_gpt(question, stream_output=False),
+            ask_question_llama(question, stream_output=False)
+        )
+
+async def compare_many(questions):
+    """
+    Compare both models on many questions concurrently
+    
+    At most MAX_CONCURRENT_COMPARISONS comparisons run at a time so a large
+    batch of questions doesn't trip the OpenAI rate limits. The semaphore is
+    created per call, since it binds to the event loop that first uses it.
+    Nothing is printed until every answer is in, then each question is shown
+    with its two responses in the order the questions were given.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPARISONS)
+    results = await asyncio.gather(*[_ask_both(semaphore, q) for q in questions])
+    
+    for question, (gpt_response, llama_response) in zip(questions, results):
+        print(f"Question: {question}")
+        print("\n" + "=" * 80)
+        _print_response("GPT-4o-mini", gpt_response)
+        print("\n" + "=" * 80)
+        _print_response("Llama 3.2", llama_response)
+        print("\n" + "=" * 80)
+    
+    return [tuple(result) for result in results]
+
 # Example usage
 if __name__ == "__main__":
     # Example question from the notebook
@@ -99,7 +239,7 @@ yield from {book.get("author") for book in books if book.get("author")}
 """
     
     # Compare both models
-    gpt_response, llama_response = compare_ai_models(question)
+    gpt_response, llama_response = asyncio.run(compare_ai_models(question))
     
     print("\n" + "=" * 80)
     print("Comparison complete!")
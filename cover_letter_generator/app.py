@@ -16,23 +16,21 @@ Learning objectives:
 5. How to create maintainable code
 """
 
-import gradio as gr
-from typing import Tuple
-
-# Import our clean, modular components
-from ui_components import (
-    create_file_upload_section,
-    create_job_description_section, 
-    create_generate_button,
-    create_output_section,
-    create_examples_section,
-    create_footer,
-    get_css_styles
-)
-from processors import CoverLetterProcessor
-
-
-def create_interface() -> gr.Blocks:
+import asyncio
+import functools
+import logging
+import socket
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+# Gradio and the OpenAI-backed processor are heavy to import, so they are
+# only loaded once the interface is actually being built
+if TYPE_CHECKING:
+    import gradio as gr
+    from processors import CoverLetterProcessor
+
+
+@functools.lru_cache(maxsize=1)
+def create_interface() -> "gr.Blocks":
     """
     Create the main Gradio interface.
     
@@ -41,9 +39,29 @@ def create_interface() -> gr.Blocks:
     - Uses helper functions for each section
     - Keeps the main function focused and readable
     
+    The interface is built once per process; later calls (from run_web.py,
+    tests or reloads) get the same Blocks object back.
+    
     Returns:
         Configured Gradio Blocks interface
     """
+    import gradio as gr
+    
+    # Import our clean, modular components
+    from ui_components import (
+        create_file_upload_section,
+        create_job_description_section, 
+        create_generate_button,
+        create_output_section,
+        create_bulk_section,
+        create_multi_resume_section,
+        create_examples_section,
+        create_footer,
+        CSS_PATH,
+        HEADER_MARKDOWN
+    )
+    from processors import CoverLetterProcessor
+    
     # Initialize our processor (contains all business logic)
     processor = CoverLetterProcessor()
     
@@ -51,62 +69,75 @@ def create_interface() -> gr.Blocks:
     with gr.Blocks(
         title="AI Cover Letter Generator",
         theme=gr.themes.Soft(),
-        css=get_css_styles()
+        css_paths=[CSS_PATH]
     ) as interface:
         
         # Main header
-        gr.Markdown("""
-        # 🤖 AI-Powered Cover Letter Generator
-        
-        Upload your resume and paste a job description to generate a personalized, professional cover letter using advanced AI analysis.
+        gr.Markdown(HEADER_MARKDOWN)
         
-        **Features:**
-        - 📄 Supports PDF, DOCX, and text files (max 2MB)
-        - 🔍 Intelligent resume and job description analysis
-        - ✍️ Personalized cover letter generation
-        - 🎯 Matches your skills to job requirements
-        - 📝 Professional formatting in markdown
-        - ⏱️ Optimized for fast processing with API timeouts
-        """)
+        with gr.Tab("✍️ Single Cover Letter"):
+            # Create the main layout using helper functions
+            with gr.Row():
+                # Left column: Inputs
+                with gr.Column(scale=1):
+                    resume_file, file_type = create_file_upload_section()
+                    job_description = create_job_description_section()
+                    generate_btn = create_generate_button()
+                
+                # Right column: Outputs
+                with gr.Column(scale=2):
+                    loading_status, cover_letter_output = create_output_section()
+            
+            # Set up event handlers (this is where the magic happens!)
+            _setup_event_handlers(
+                generate_btn, 
+                resume_file, 
+                job_description, 
+                file_type,
+                cover_letter_output, 
+                loading_status,
+                processor
+            )
         
-        # Create the main layout using helper functions
-        with gr.Row():
-            # Left column: Inputs
-            with gr.Column(scale=1):
-                resume_file, file_type = create_file_upload_section()
-                job_description = create_job_description_section()
-                generate_btn = create_generate_button()
+        with gr.Tab("📦 Bulk Mode"):
+            bulk_resume_file, bulk_file_type, jobs_file, bulk_btn, bulk_output = create_bulk_section()
             
-            # Right column: Outputs
-            with gr.Column(scale=2):
-                loading_status, cover_letter_output = create_output_section()
+            # Bulk mode reports progress from the batch status, so keep
+            # Gradio's progress bar enabled here
+            bulk_btn.click(
+                fn=processor.process_batch,
+                inputs=[bulk_resume_file, jobs_file, bulk_file_type],
+                outputs=[bulk_output]
+            )
         
-        # Set up event handlers (this is where the magic happens!)
-        _setup_event_handlers(
-            generate_btn, 
-            resume_file, 
-            job_description, 
-            file_type,
-            cover_letter_output, 
-            loading_status,
-            processor
-        )
+        with gr.Tab("👥 Multiple Resumes"):
+            multi_resume_files, multi_file_type, multi_job_description, multi_btn, multi_output = create_multi_resume_section()
+            
+            multi_btn.click(
+                fn=processor.process_resumes,
+                inputs=[multi_resume_files, multi_job_description, multi_file_type],
+                outputs=[multi_output]
+            )
         
         # Add examples and footer
         create_examples_section()
         create_footer()
+        
+        # Open the OpenAI connection when the page first loads, so the first
+        # cover letter doesn't also pay for the TLS handshake
+        interface.load(fn=processor.warm_up)
     
     return interface
 
 
 def _setup_event_handlers(
-    generate_btn: gr.Button,
-    resume_file: gr.File,
-    job_description: gr.Textbox,
-    file_type: gr.Dropdown,
-    cover_letter_output: gr.Markdown,
-    loading_status: gr.Markdown,
-    processor: CoverLetterProcessor
+    generate_btn: "gr.Button",
+    resume_file: "gr.File",
+    job_description: "gr.Textbox",
+    file_type: "gr.Dropdown",
+    cover_letter_output: "gr.Markdown",
+    loading_status: "gr.Markdown",
+    processor: "CoverLetterProcessor"
 ) -> None:
     """
     Set up the event handlers for the interface.
@@ -132,13 +163,50 @@ def _setup_event_handlers(
         fn=processor.show_loading_status,  # Show loading immediately and clear output
         outputs=[loading_status, cover_letter_output]
     ).then(
-        fn=processor.process_cover_letter,  # Then process the request
+        fn=processor.process_cover_letter,  # Then process the request, streaming the letter as it is written
         inputs=[resume_file, job_description, file_type],
         outputs=[cover_letter_output, loading_status],
         show_progress=False  # Disable Gradio's built-in progress indicator
     )
 
 
+def _find_free_port(candidates: List[int]) -> Optional[int]:
+    """
+    Return the first port from candidates that can be bound, or None.
+    
+    Args:
+        candidates: Ports to try, in order of preference
+    
+    Returns:
+        A free port number, or None if every candidate is taken
+    """
+    for port in candidates:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("0.0.0.0", port))
+                return port
+            except OSError:
+                continue
+    return None
+
+
+def _enable_uvloop() -> None:
+    """
+    Use uvloop's event loop when it is installed.
+    
+    Uvicorn (which serves the Gradio app) already prefers uvloop and
+    httptools when they are available; setting the policy here makes every
+    event loop created by this process use uvloop as well.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    print("⚡ Using uvloop event loop")
+
+
 def main() -> None:
     """
     Main function to run the application.
@@ -148,43 +216,41 @@ def main() -> None:
     - Port handling for development
     - Clean error handling
     """
+    # Per-request progress is logged rather than printed; INFO shows each
+    # stage, set the level to DEBUG to also see cache hits and raw AI output
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("🚀 Starting AI Cover Letter Generator...")
     print("📱 Opening Gradio interface...")
     print("💡 If browser doesn't open automatically, look for the URL in the output below!")
     
+    _enable_uvloop()
+    
     # Create the interface
     interface = create_interface()
     
-    # Try different ports if the default is occupied
+    # Pick the first free port up front; a failed launch() only fails after
+    # the whole server has started up, so probing with a socket is much cheaper
     ports_to_try = [7860, 7861, 7862, 7863, 7864]
+    port = _find_free_port(ports_to_try)
+    if port is None:
+        print(f"❌ Failed to launch: no free port in {ports_to_try}")
+        return
     
-    for port in ports_to_try:
-        try:
-            print(f"🚀 Trying to launch on port {port}...")
-            print(f"✅ Successfully launched on port {port}!")
-            print(f"🌐 Local access: http://127.0.0.1:{port}")
-            print(f"🌍 Public URL will be generated by Gradio...")
-            
-            interface.launch(
-                server_name="0.0.0.0",  # Allow external connections
-                server_port=port,
-                share=True,  # Enable Gradio's public sharing
-                show_error=True,
-                quiet=False,
-                inbrowser=True  # Automatically open browser
-            )
-            break
-            
-        except OSError as e:
-            if "Cannot find empty port" in str(e) and port < ports_to_try[-1]:
-                print(f"❌ Port {port} is busy, trying next port...")
-                continue
-            else:
-                print(f"❌ Failed to launch: {e}")
-                break
+    print(f"🚀 Launching on port {port}...")
+    print(f"🌐 Local access: http://127.0.0.1:{port}")
+    print(f"🌍 Public URL will be generated by Gradio...")
+    
+    interface.launch(
+        server_name="0.0.0.0",  # Allow external connections
+        server_port=port,
+        share=True,  # Enable Gradio's public sharing
+        show_error=True,
+        quiet=False,
+        inbrowser=True  # Automatically open browser
+    )
 
 
 # This is the standard Python idiom for running a script
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,106 @@
+# Batch Client Module
+# Runs many chat completion requests through the OpenAI Batch API
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import fast_json
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Called with (status, completed_requests, total_requests) after every poll
+StatusCallback = Callable[[str, int, int], None]
+
+
+class BatchRunner:
+    """Submits chat completion requests as one OpenAI batch and collects the results"""
+
+    def __init__(self, openai_client: "AsyncOpenAI", poll_interval: float = 5.0, max_poll_interval: float = 60.0):
+        self.openai_client = openai_client
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    async def run(self, request_bodies: List[Dict[str, Any]], on_status: Optional[StatusCallback] = None) -> List[Optional[str]]:
+        """
+        Run chat completion requests as a single batch.
+
+        Batched requests are billed at half the price of regular requests and
+        do not count against the per-minute rate limits.
+
+        Args:
+            request_bodies: Chat completion request bodies (model, messages, ...)
+            on_status: Optional callback receiving progress after every poll
+
+        Returns:
+            Message content for each request, in order (None for failed requests)
+        """
+        if not request_bodies:
+            return []
+
+        batch_file = await self.openai_client.files.create(
+            file=("cover_letter_batch.jsonl", self._build_batch_file(request_bodies)),
+            purpose="batch"
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW
+        )
+
+        batch = await self._wait_for_completion(batch.id, on_status)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+        return await self._read_results(batch.output_file_id, len(request_bodies))
+
+    def _build_batch_file(self, request_bodies: List[Dict[str, Any]]) -> bytes:
+        """Build the JSONL batch input, one request per line keyed by its index"""
+        lines = [
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": body
+            })
+            for index, body in enumerate(request_bodies)
+        ]
+        return "\n".join(lines).encode("utf-8")
+
+    async def _wait_for_completion(self, batch_id: str, on_status: Optional[StatusCallback]):
+        """Poll the batch with exponential backoff until it reaches a terminal status"""
+        interval = self.poll_interval
+        while True:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+
+            if on_status and batch.request_counts:
+                on_status(batch.status, batch.request_counts.completed, batch.request_counts.total)
+
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def _read_results(self, output_file_id: Optional[str], count: int) -> List[Optional[str]]:
+        """Download the batch output and order the results by request index"""
+        results: List[Optional[str]] = [None] * count
+        if not output_file_id:
+            return results
+
+        output = (await self.openai_client.files.content(output_file_id)).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = fast_json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                index = int(record["custom_id"])
+                results[index] = response["body"]["choices"][0]["message"]["content"]
+
+        return results
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Cache cleanup script for the Cover Letter Generator.
+
+Removes Python bytecode caches, Gradio caches and temporary files created
+while running the application. Only the application's own directory is
+cleaned, wherever the script is run from.
+
+The directory is scanned once and the result is shared by every cleanup
+step, so each directory entry is only read a single time.
+
+Run with: python cleanup.py           (lists what would be removed)
+          python cleanup.py --delete  (removes it)
+"""
+
+import argparse
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# The application's directory; nothing outside it is touched
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directories that are never descended into
+SKIP_DIRS = {".git", ".venv", "venv", "env", "node_modules"}
+
+# File suffixes treated as temporary files
+TEMP_SUFFIXES = (".tmp", ".temp", ".log", ".pid")
+
+# Gradio caches created in the application's directory
+GRADIO_CACHE_DIRS = [
+    os.path.join(APP_DIR, ".gradio"),
+    os.path.join(APP_DIR, "gradio_cached_examples"),
+]
+
+# Upper bound on deletion threads; removal is syscall-bound, not CPU-bound
+MAX_DELETE_WORKERS = 32
+
+ScanEntry = Tuple[str, str]  # (kind, path) where kind is "pycache", "pyc" or "temp"
+
+
+def _scan(root: str = APP_DIR) -> Iterator[ScanEntry]:
+    """
+    Walk the tree once, yielding every cache-related entry.
+    
+    Uses os.scandir so file/directory checks come from the cached dirent
+    type instead of a separate stat call per entry. Directories are walked
+    with an explicit stack rather than recursion, so deep trees don't pay
+    for a chain of nested generators. Names are matched with str.endswith
+    rather than glob patterns.
+    
+    Args:
+        root: Directory to start scanning from
+    
+    Yields:
+        Tuples of (kind, path)
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in SKIP_DIRS:
+                            continue
+                        if entry.name == "__pycache__":
+                            yield "pycache", entry.path
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".pyc"):
+                        yield "pyc", entry.path
+                    elif entry.name.endswith(TEMP_SUFFIXES):
+                        yield "temp", entry.path
+        except OSError as e:
+            print(f"⚠️ Could not scan {directory}: {e}")
+
+
+def _try_remove(remove: Callable[[str], None], path: str) -> Optional[str]:
+    """Run a removal function, returning an error message instead of raising."""
+    try:
+        remove(path)
+        return None
+    except OSError as e:
+        return f"{path}: {e}"
+
+
+def _remove_all(remove: Callable[[str], None], paths: List[str]) -> List[str]:
+    """
+    Remove independent paths concurrently.
+    
+    Deleting many small files is bound by unlink syscalls, so spreading the
+    work over a thread pool overlaps them instead of waiting on each in turn.
+    
+    Args:
+        remove: Function that deletes a single path (e.g. os.remove)
+        paths: Paths to delete
+    
+    Returns:
+        Error messages for the paths that could not be removed
+    """
+    if not paths:
+        return []
+    
+    workers = min(MAX_DELETE_WORKERS, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda path: _try_remove(remove, path), paths)
+        return [error for error in results if error]
+
+
+def _report(label: str, removed: int, errors: List[str]) -> None:
+    """Print a summary line and any errors for a cleanup step."""
+    print(f"   Removed {removed - len(errors)} {label}")
+    for error in errors:
+        print(f"   ❌ Could not remove {error}")
+
+
+def clean_python_cache(entries: List[ScanEntry]) -> None:
+    """Remove __pycache__ directories and stray .pyc files."""
+    print("🧹 Cleaning Python cache...")
+    
+    pycache_dirs = [path for kind, path in entries if kind == "pycache"]
+    errors = _remove_all(shutil.rmtree, pycache_dirs)
+    _report("__pycache__ directories", len(pycache_dirs), errors)
+    
+    # .pyc files inside a removed __pycache__ are already gone
+    removed = set(pycache_dirs)
+    pyc_files = [
+        path for kind, path in entries
+        if kind == "pyc" and os.path.dirname(path) not in removed
+    ]
+    errors = _remove_all(os.remove, pyc_files)
+    _report(".pyc files", len(pyc_files), errors)
+
+
+def clean_gradio_cache() -> None:
+    """Remove Gradio cache directories."""
+    print("🧹 Cleaning Gradio cache...")
+    
+    cache_dirs = [path for path in GRADIO_CACHE_DIRS if os.path.isdir(path)]
+    errors = _remove_all(shutil.rmtree, cache_dirs)
+    _report("Gradio cache directories", len(cache_dirs), errors)
+
+
+def clean_temp_files(entries: List[ScanEntry]) -> None:
+    """Remove temporary and log files."""
+    print("🧹 Cleaning temporary files...")
+    
+    temp_files = [path for kind, path in entries if kind == "temp"]
+    errors = _remove_all(os.remove, temp_files)
+    _report("temporary files", len(temp_files), errors)
+
+
+def show_cache_info(entries: List[ScanEntry]) -> None:
+    """Print a summary of the cache files found."""
+    counts = Counter(kind for kind, _ in entries)
+    
+    print("📊 Cache information:")
+    print(f"   __pycache__ directories: {counts['pycache']}")
+    print(f"   .pyc files: {counts['pyc']}")
+    print(f"   Temporary files: {counts['temp']}")
+
+
+def list_removals(entries: List[ScanEntry]) -> None:
+    """Print every path a cleanup would remove."""
+    # .pyc files inside a listed __pycache__ go with it
+    pycache_dirs = {path for kind, path in entries if kind == "pycache"}
+    paths = [
+        path for kind, path in entries
+        if kind != "pyc" or os.path.dirname(path) not in pycache_dirs
+    ]
+    paths += [path for path in GRADIO_CACHE_DIRS if os.path.isdir(path)]
+    
+    print("📋 Would remove:")
+    for path in paths:
+        print(f"   {path}")
+    if not paths:
+        print("   Nothing")
+
+
+def main() -> None:
+    """Scan the application directory once, then list or remove what was found."""
+    parser = argparse.ArgumentParser(description="Remove the Cover Letter Generator's caches and temporary files.")
+    parser.add_argument("--delete", action="store_true", help="remove the files (by default they are only listed)")
+    args = parser.parse_args()
+    
+    print(f"🚀 Starting cache cleanup in {APP_DIR}...")
+    
+    entries = list(_scan(APP_DIR))
+    show_cache_info(entries)
+    
+    if not args.delete:
+        list_removals(entries)
+        print("ℹ️ Nothing was removed. Run with --delete to remove the files listed above.")
+        return
+    
+    clean_python_cache(entries)
+    clean_gradio_cache()
+    clean_temp_files(entries)
+    
+    print("✅ Cleanup complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,74 @@
 # Configuration settings for the Cover Letter Generator
 
+import json
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
-# Load environment variables
-load_dotenv(override=True)
 
 # OpenAI Configuration
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-if not OPENAI_API_KEY:
-    raise ValueError(
-        "OPENAI_API_KEY not found! Please check your .env file.\n"
-        "Make sure you have a .env file in the same directory with:\n"
-        "OPENAI_API_KEY=your_api_key_here"
-    )
+@lru_cache(maxsize=None)
+def get_openai_api_key() -> str:
+    """
+    Load the OpenAI API key from the environment (or .env file) on first use.
+    
+    Deferred until a client is created, so importing the app's modules
+    doesn't pay for loading dotenv or fail when no key is configured.
+    """
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv(override=True)
+    
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError(
+            "OPENAI_API_KEY not found! Please check your .env file.\n"
+            "Make sure you have a .env file in the same directory with:\n"
+            "OPENAI_API_KEY=your_api_key_here"
+        )
+    return api_key
+
+
+# One client (and so one connection pool) shared by every OpenAI caller
+_shared_client: Optional["AsyncOpenAI"] = None
+
+
+def get_openai_client() -> "AsyncOpenAI":
+    """
+    Return the shared async OpenAI client, creating it on first use.
+    
+    The client keeps HTTP/2 connections alive in a single pool, so resume
+    parsing, job analysis and generation all reuse the same connection
+    instead of each paying for its own TCP/TLS handshake.
+    """
+    global _shared_client
+    if _shared_client is None:
+        import httpx
+        from openai import AsyncOpenAI
+        
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            # Enforced at the socket by httpx for every request; while
+            # streaming, the read timeout applies to the gap between chunks
+            timeout=httpx.Timeout(connect=5.0, read=45.0, write=10.0, pool=5.0)
+        )
+        _shared_client = AsyncOpenAI(api_key=get_openai_api_key(), http_client=http_client)
+    return _shared_client
+
 
 MODEL = "gpt-4o-mini"
 
+# Tokens of resume text sent to the AI when tiktoken is installed (resume_parser
+# falls back to a character limit without it). Well inside the model's context
+# window, leaving room for the prompt and the response, but enough for any
+# real resume
+MAX_RESUME_TOKENS = 2500
+
 # System Messages
 SYSTEM_MESSAGE = """You are an expert career counselor and professional writer specializing in creating compelling, personalized cover letters. 
 
@@ -33,6 +85,41 @@ RESUME_ANALYSIS_PROMPT = """You are a resume analysis expert. Extract informatio
 
 JOB_ANALYSIS_PROMPT = """You are a job market analyst. Extract information and return only valid JSON."""
 
+# Cover letter generation prompt, filled in with str.format
+GENERATION_PROMPT_TEMPLATE = """
+Create a professional, personalized cover letter based on the following information:
+
+CANDIDATE INFORMATION:
+Name: {name}
+Skills: {skills}
+Experience: {experience_count} positions
+Education: {education}
+
+JOB INFORMATION:
+Company: {company_name}
+Position: {job_title}
+Required Skills: {required_skills}
+Key Responsibilities: {key_responsibilities}
+
+PRE-COMPUTED ANALYSIS:
+- Match: {match}
+- Top selling points: {selling_points}
+
+REQUIREMENTS:
+1. Write in professional, engaging tone
+2. Highlight specific skills and experiences that match the job
+3. Show enthusiasm for the company and role
+4. Keep it concise but compelling (3-4 paragraphs)
+5. Use proper business letter format
+6. Include specific examples from the candidate's background
+7. Address the hiring manager professionally
+8. End with a strong call to action
+
+Format the cover letter in markdown with proper headers and structure.
+"""
+
+COMBINED_ANALYSIS_PROMPT = """You are a resume analysis expert and job market analyst. Extract information and return only valid JSON."""
+
 # Resume Structure Template
 RESUME_TEMPLATE = {
     "name": "Full name",
@@ -75,6 +162,36 @@ JOB_TEMPLATE = {
     "employment_type": "Full-time, Part-time, etc."
 }
 
+# Templates serialized once for interpolation into the analysis prompts
+RESUME_TEMPLATE_JSON = json.dumps(RESUME_TEMPLATE, indent=2)
+JOB_TEMPLATE_JSON = json.dumps(JOB_TEMPLATE, indent=2)
+
+# Structured output for batched generation: the job analysis and the cover
+# letter are produced by a single request
+FUSED_LETTER_SCHEMA = {
+    "name": "cover_letter_with_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "job_analysis": {
+                "type": "object",
+                "properties": {
+                    "company_name": {"type": "string"},
+                    "job_title": {"type": "string"},
+                    "required_skills": {"type": "array", "items": {"type": "string"}},
+                    "key_responsibilities": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["company_name", "job_title", "required_skills", "key_responsibilities"],
+                "additionalProperties": False
+            },
+            "cover_letter": {"type": "string"}
+        },
+        "required": ["job_analysis", "cover_letter"],
+        "additionalProperties": False
+    }
+}
+
 # Fallback Data Structures
 FALLBACK_RESUME_DATA = {
     "name": "Unknown",
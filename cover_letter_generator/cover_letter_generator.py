@@ -1,110 +1,477 @@
 # Cover Letter Generator Module
-# Main agent for generating personalized cover letters using AI tools
+# Main agent for generating personalized cover letters using AI
 
+import asyncio
+import atexit
+import hashlib
 import json
-from typing import Dict, Any
+import logging
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
-from openai import OpenAI
 
-from config import MODEL, SYSTEM_MESSAGE, OPENAI_API_KEY
+import fast_json
+from config import (
+    MODEL, SYSTEM_MESSAGE, GENERATION_PROMPT_TEMPLATE, COMBINED_ANALYSIS_PROMPT, RESUME_TEMPLATE_JSON, JOB_TEMPLATE_JSON,
+    FALLBACK_RESUME_DATA, FALLBACK_JOB_DATA, FUSED_LETTER_SCHEMA, get_openai_client
+)
 from resume_parser import ResumeParser
 from job_analyzer import JobAnalyzer
+from batch_client import BatchRunner, StatusCallback
+from data_types import ResumeData, JobData
+
+try:
+    import diskcache
+except ImportError:  # Optional; without it the caches live in memory
+    diskcache = None
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+# Number of finished cover letters kept, keyed by (resume, job description)
+RESULT_CACHE_SIZE = 128
+
+# Number of parsed resumes and analyzed job descriptions kept, each keyed on its own
+DATA_CACHE_SIZE = 128
+
+# Entries kept per in-memory cache when diskcache is not installed
+MEMORY_CACHE_SIZES = {"letter": RESULT_CACHE_SIZE, "resume": DATA_CACHE_SIZE, "job": DATA_CACHE_SIZE}
+
+# Without diskcache, finished cover letters are saved here on exit and
+# reloaded on start-up
+RESULT_CACHE_PATH = os.path.expanduser("~/.cache/cover_letter_generator/cache.json")
+
+# With diskcache, every cache is stored here instead
+DISK_CACHE_DIR = os.path.expanduser("~/.cache/cover_letter_generator/diskcache")
+DISK_CACHE_SIZE_LIMIT = 1 << 30  # 1 GB
+DISK_CACHE_EXPIRE = 7 * 24 * 60 * 60  # One week, in seconds
+
+
+# Runs of whitespace, collapsed to one space when normalizing job descriptions
+WHITESPACE_RUN = re.compile(r'\s+')
+
+
+def _canonical_job_description(job_description: str) -> str:
+    """
+    Normalize a job description so trivially different copies hash the same.
+    
+    Applies Unicode NFKC normalization (so e.g. non-breaking spaces and
+    full-width characters from copy-paste match their plain forms), then
+    lowercases and collapses all whitespace.
+    """
+    text = unicodedata.normalize("NFKC", job_description).lower()
+    return WHITESPACE_RUN.sub(" ", text).strip()
+
+
+def _lru_put(cache: OrderedDict, key: str, value: Any, max_size: int) -> None:
+    """Store a value in an LRU cache, evicting the least recently used entry when full"""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+def _is_cacheable(data: Any, fallback: Dict[str, Any]) -> bool:
+    """
+    Whether parsed data is a real result worth caching.
+    
+    Errors aren't cached, and neither are the fallback placeholders the
+    parsers return when the AI response can't be decoded, so a bad reply
+    is retried next time instead of being reused for a week.
+    """
+    return isinstance(data, dict) and "error" not in data and data is not fallback
+
+
+class GenerationError(Exception):
+    """A cover letter could not be generated; the message is shown to the user"""
 
 
 class CoverLetterGenerator:
     """Main agent for generating personalized cover letters"""
     
-    def __init__(self):
-        self.resume_parser = ResumeParser()
-        self.job_analyzer = JobAnalyzer()
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, openai_client: Optional["AsyncOpenAI"] = None):
+        # Every AI call goes through one client so they share its connections
+        self.openai_client = openai_client or get_openai_client()
+        self.resume_parser = ResumeParser(self.openai_client)
+        self.job_analyzer = JobAnalyzer(self.openai_client)
         
-        # Define tools for the AI agent
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "analyze_resume_match",
-                    "description": "Analyze how well the candidate's resume matches the job requirements",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "resume_data": {
-                                "type": "object",
-                                "description": "Parsed resume data"
-                            },
-                            "job_data": {
-                                "type": "object", 
-                                "description": "Parsed job description data"
-                            }
-                        },
-                        "required": ["resume_data", "job_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "identify_key_selling_points",
-                    "description": "Identify the candidate's strongest selling points for this specific job",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "resume_data": {
-                                "type": "object",
-                                "description": "Parsed resume data"
-                            },
-                            "job_data": {
-                                "type": "object",
-                                "description": "Parsed job description data"
-                            }
-                        },
-                        "required": ["resume_data", "job_data"]
-                    }
-                }
-            }
-        ]
+        # Three caches, so nothing seen before is sent to the AI again:
+        #   "letter": finished cover letters, keyed by resume hash + job hash
+        #   "resume": parsed resume data, keyed by sha256 of the resume bytes
+        #   "job": analyzed job data, keyed by sha256 of the job description
+        # With diskcache they are stored on disk, so they survive restarts and
+        # are shared between worker processes
+        self._disk_cache = None
+        if diskcache is not None:
+            self._disk_cache = diskcache.Cache(DISK_CACHE_DIR, size_limit=DISK_CACHE_SIZE_LIMIT)
+        
+        self._memory_caches: Dict[str, OrderedDict] = {name: OrderedDict() for name in MEMORY_CACHE_SIZES}
+        if self._disk_cache is None:
+            self._memory_caches["letter"] = self._load_result_cache()
+            atexit.register(self._save_result_cache)
     
-    def generate_cover_letter(self, resume_file, job_description: str, file_type: str = "pdf", progress=None) -> str:
-        """Generate a personalized cover letter using AI agents and tools"""
+    async def generate_cover_letter(self, resume_file, job_description: str, file_type: str = "pdf", progress=None) -> AsyncIterator[str]:
+        """
+        Generate a personalized cover letter using AI.
+        
+        Yields the cover letter (with its metadata header) as it is being
+        written, so callers can display it while the model is still streaming.
+        
+        Raises:
+            GenerationError: If the letter can't be generated, with a message for the user
+        """
+        from openai import APITimeoutError
+        
         try:
-            # Step 1: Parse resume
-            print("📄 Parsing resume...")
             file_path = self._get_file_path(resume_file)
-            resume_data = self.resume_parser.parse_resume(file_path, file_type)
+            
+            # Reuse the letter from an earlier run with the same inputs
+            resume_hash = self._hash_file(file_path)
+            job_hash = self._hash_job_description(job_description)
+            cache_key = f"{resume_hash}:{job_hash}"
+            cached_letter = self._cache_get("letter", cache_key)
+            if cached_letter is not None:
+                logger.debug("♻️ Using cached cover letter")
+                yield cached_letter
+                return
+            
+            # Steps 1 & 2: Parse resume and analyze job description
+            logger.info("📄 Parsing resume and 🔍 analyzing job description...")
+            if self._cache_get("resume", resume_hash) is None and self._cache_get("job", job_hash) is None:
+                # Neither has been seen before, so extract both with one AI call
+                resume_data, job_data = await self._extract_resume_and_job(
+                    file_path, file_type, resume_hash, job_description, job_hash
+                )
+                if progress:
+                    progress(1, desc="🔍 Resume and job description analyzed")
+            else:
+                # One side is cached; the other is fetched on its own. Running
+                # them side by side waits for the slower of the two instead of
+                # both in turn
+                resume_task = asyncio.create_task(self._parse_resume_cached(file_path, file_type, resume_hash))
+                job_task = asyncio.create_task(self._analyze_job_cached(job_description, job_hash))
+                
+                if progress:
+                    steps = {resume_task: "📄 Resume parsed", job_task: "🔍 Job description analyzed"}
+                    pending = set(steps)
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            progress(1 - len(pending) / len(steps), desc=steps[task])
+                
+                resume_data, job_data = await asyncio.gather(resume_task, job_task)
             
             if not isinstance(resume_data, dict):
-                return f"Error: Resume parser returned invalid data type: {type(resume_data)}"
+                raise GenerationError(f"Error: Resume parser returned invalid data type: {type(resume_data)}")
             
             if "error" in resume_data:
-                return f"Error parsing resume: {resume_data['error']}"
-            
-            # Step 2: Analyze job description
-            print("🔍 Analyzing job description...")
-            job_data = self.job_analyzer.analyze_job_description(job_description)
+                raise GenerationError(f"Error parsing resume: {resume_data['error']}")
             
             if not isinstance(job_data, dict):
-                return f"Error: Job analyzer returned invalid data type: {type(job_data)}"
+                raise GenerationError(f"Error: Job analyzer returned invalid data type: {type(job_data)}")
             
             if "error" in job_data:
-                return f"Error analyzing job description: {job_data['error']}"
+                raise GenerationError(f"Error analyzing job description: {job_data['error']}")
             
             # Step 3: Generate cover letter
-            print("✍️ Generating personalized cover letter...")
+            logger.info("✍️ Generating personalized cover letter...")
             self._validate_data_structures(resume_data, job_data)
+            resume = ResumeData.from_dict(resume_data)
+            job = JobData.from_dict(job_data)
             
-            # Create and send prompt to AI
-            cover_letter = self._generate_with_ai(resume_data, job_data)
+            # Stream the letter from the AI, prefixed with its metadata header.
+            # The header is shown straight away so the output isn't blank while
+            # the model works towards its first token
+            header = self._create_metadata_header(resume, job)
+            yield header
             
-            # Add metadata and return
-            try:
-                result = self._add_metadata(cover_letter, resume_data, job_data)
-                return result
-            except Exception as metadata_error:
-                return f"Error finalizing cover letter: {str(metadata_error)}\n\nGenerated content:\n{cover_letter}"
+            parts = []
+            async for piece in self._generate_with_ai(resume, job):
+                parts.append(piece)
+                yield header + "".join(parts)
             
+            if parts:
+                self._cache_put("letter", cache_key, header + "".join(parts))
+        
+        except GenerationError:
+            raise
+        
+        except APITimeoutError as e:
+            raise GenerationError(
+                "Error generating cover letter: the AI service took too long to respond. Please try again."
+            ) from e
+        
+        except Exception as e:
+            raise GenerationError(f"Error generating cover letter: {str(e)}") from e
+    
+    async def generate_cover_letters_batch(
+        self,
+        resume_file,
+        job_descriptions: List[str],
+        file_type: str = "pdf",
+        on_status: Optional[StatusCallback] = None
+    ) -> List[str]:
+        """
+        Generate cover letters for many job descriptions using the OpenAI Batch API.
+        
+        The resume is parsed once; then a single batch is submitted in which
+        every request analyzes its job description and writes the cover letter
+        in the same response. Batch requests cost half as much as regular
+        requests but can take a while to complete.
+        """
+        # Step 1: Parse resume once for every job
+        logger.info("📄 Parsing resume...")
+        file_path = self._get_file_path(resume_file)
+        resume_data = await self._parse_resume_cached(file_path, file_type, self._hash_file(file_path))
+        
+        if not isinstance(resume_data, dict):
+            return [f"Error: Resume parser returned invalid data type: {type(resume_data)}"] * len(job_descriptions)
+        
+        if "error" in resume_data:
+            return [f"Error parsing resume: {resume_data['error']}"] * len(job_descriptions)
+        
+        resume = ResumeData.from_dict(resume_data)
+        runner = BatchRunner(self.openai_client)
+        
+        # Step 2: Analyze each job and write its cover letter in one batch.
+        # Every request returns both as structured output, so there is no
+        # second batch waiting in the queue behind the analyses
+        logger.info("✍️ Submitting %d cover letters for batch generation...", len(job_descriptions))
+        requests = [
+            {
+                "model": MODEL,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_MESSAGE},
+                    {"role": "user", "content": self._create_fused_prompt(resume, job_description)}
+                ],
+                "response_format": {"type": "json_schema", "json_schema": FUSED_LETTER_SCHEMA},
+                "temperature": 0.7
+            }
+            for job_description in job_descriptions
+        ]
+        responses = await runner.run(requests, self._stage_status("Writing cover letters", on_status))
+        
+        # Step 3: Split each response into its analysis and cover letter
+        results = []
+        for response in responses:
+            if response is None:
+                results.append("Error generating cover letter: batch request failed")
+                continue
+            
+            # A malformed response only fails its own letter, not the whole batch
+            try:
+                result = fast_json.loads(response)
+                job = JobData.from_dict(result["job_analysis"])
+                results.append(self._add_metadata(result["cover_letter"], resume, job))
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                results.append(f"Error generating cover letter: invalid batch response ({e!r})")
+        
+        return results
+    
+    def _stage_status(self, stage: str, on_status: Optional[StatusCallback]) -> Optional[StatusCallback]:
+        """Prefix batch status updates with the name of the current stage"""
+        if on_status is None:
+            return None
+        return lambda status, completed, total: on_status(f"{stage} ({status})", completed, total)
+    
+    def _hash_file(self, file_path: str) -> str:
+        """Hash the raw bytes of a file"""
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    def _hash_job_description(self, job_description: str) -> str:
+        """Hash a job description, ignoring case, whitespace and Unicode variants"""
+        return hashlib.sha256(_canonical_job_description(job_description).encode("utf-8")).hexdigest()
+    
+    async def _parse_resume_cached(self, file_path: str, file_type: str, resume_hash: str) -> Dict[str, Any]:
+        """Parse a resume, reusing the result for a file parsed before"""
+        cached = self._cache_get("resume", resume_hash)
+        if cached is not None:
+            logger.debug("♻️ Using cached resume data")
+            return cached
+        
+        resume_data = await self.resume_parser.parse_resume(file_path, file_type)
+        if _is_cacheable(resume_data, FALLBACK_RESUME_DATA):
+            self._cache_put("resume", resume_hash, resume_data)
+        return resume_data
+    
+    async def _analyze_job_cached(self, job_description: str, job_hash: str) -> Dict[str, Any]:
+        """Analyze a job description, reusing the result for one analyzed before"""
+        cached = self._cache_get("job", job_hash)
+        if cached is not None:
+            logger.debug("♻️ Using cached job analysis")
+            return cached
+        
+        job_data = await self.job_analyzer.analyze_job_description(job_description)
+        if _is_cacheable(job_data, FALLBACK_JOB_DATA):
+            self._cache_put("job", job_hash, job_data)
+        return job_data
+    
+    def _cache_get(self, name: str, key: str) -> Optional[Any]:
+        """Look up an entry in one of the caches, returning None on a miss"""
+        if self._disk_cache is not None:
+            return self._disk_cache.get(f"{name}:{key}")
+        
+        cache = self._memory_caches[name]
+        if key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+    
+    def _cache_put(self, name: str, key: str, value: Any) -> None:
+        """Store an entry in one of the caches"""
+        if self._disk_cache is not None:
+            self._disk_cache.set(f"{name}:{key}", value, expire=DISK_CACHE_EXPIRE)
+        else:
+            _lru_put(self._memory_caches[name], key, value, MEMORY_CACHE_SIZES[name])
+    
+    def _load_result_cache(self) -> "OrderedDict[str, str]":
+        """
+        Load cover letters saved by a previous session.
+        
+        The file is plain JSON (never pickle, which would run code from a
+        user-writable file), and anything other than an object of string
+        keys and string letters is ignored.
+        """
+        try:
+            with open(RESULT_CACHE_PATH, "rb") as f:
+                data = fast_json.loads(f.read())
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            logger.warning("⚠️ Ignoring unreadable cover letter cache: %s", e)
+            return OrderedDict()
+        
+        if not isinstance(data, dict):
+            return OrderedDict()
+        cache = OrderedDict(
+            (key, letter) for key, letter in data.items()
+            if isinstance(key, str) and isinstance(letter, str)
+        )
+        while len(cache) > RESULT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return cache
+    
+    def _save_result_cache(self) -> None:
+        """Save cached cover letters so the next session can reuse them"""
+        letters = self._memory_caches["letter"]
+        if not letters:
+            return
+        try:
+            os.makedirs(os.path.dirname(RESULT_CACHE_PATH), exist_ok=True)
+            temp_path = RESULT_CACHE_PATH + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(letters, f)
+            os.replace(temp_path, RESULT_CACHE_PATH)
+        except OSError as e:
+            logger.warning("⚠️ Could not save cover letter cache: %s", e)
+    
+    async def _extract_resume_and_job(
+        self,
+        file_path: str,
+        file_type: str,
+        resume_hash: str,
+        job_description: str,
+        job_hash: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Extract the resume text locally, then analyze it and the job description together.
+        
+        If the combined response isn't usable, the resume and the job
+        description are analyzed separately instead.
+        """
+        size_error = self.resume_parser.check_file_size(file_path)
+        if size_error:
+            return {"error": size_error}, {}
+        
+        resume_text = await self.resume_parser.extract_resume_text(file_path, file_type)
+        combined = await self._combined_extract(resume_text, job_description)
+        if combined is None:
+            return await asyncio.gather(
+                self._parse_resume_cached(file_path, file_type, resume_hash),
+                self._analyze_job_cached(job_description, job_hash)
+            )
+        
+        resume_data, job_data = combined
+        if _is_cacheable(resume_data, FALLBACK_RESUME_DATA):
+            self._cache_put("resume", resume_hash, resume_data)
+        if _is_cacheable(job_data, FALLBACK_JOB_DATA):
+            self._cache_put("job", job_hash, job_data)
+        return resume_data, job_data
+    
+    async def _combined_extract(self, resume_text: str, job_description: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Extract resume data and job data with a single AI call.
+        
+        One JSON response holds both, which saves a round trip and the
+        duplicated system prompt compared to analyzing them separately.
+        
+        Returns:
+            (resume_data, job_data), or None if the response isn't valid JSON
+            with a "resume" and a "job" object
+        
+        Raises:
+            APITimeoutError: If the AI service times out, so the caller can report it as such
+        """
+        from openai import APITimeoutError
+        
+        analysis_prompt = f"""
+        Analyze the resume and the job description below. Return a JSON object with
+        a "resume" key and a "job" key in the following formats.
+        
+        "resume":
+        {RESUME_TEMPLATE_JSON}
+        
+        "job":
+        {JOB_TEMPLATE_JSON}
+        
+        Resume text:
+        {resume_text}
+        
+        Job Description:
+        {job_description}
+        
+        Return only valid JSON, no additional text.
+        """
+        
+        try:
+            response = await self.openai_client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": COMBINED_ANALYSIS_PROMPT},
+                    {"role": "user", "content": analysis_prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1
+            )
+            data = fast_json.loads(response.choices[0].message.content)
+        
+        except json.JSONDecodeError as json_err:
+            logger.error("❌ Combined analysis JSON parsing error: %s", json_err)
+            return None
+        
+        except APITimeoutError:
+            raise
+        
         except Exception as e:
-            return f"Error generating cover letter: {str(e)}"
+            logger.error("❌ Combined analysis error: %s", e)
+            error = f"Failed to analyze resume and job description: {str(e)}"
+            return {"error": error}, {"error": error}
+        
+        resume_data = data.get("resume") if isinstance(data, dict) else None
+        job_data = data.get("job") if isinstance(data, dict) else None
+        if not isinstance(resume_data, dict) or not isinstance(job_data, dict) or not resume_data or not job_data:
+            logger.error("❌ Combined analysis response is missing the resume or job data")
+            return None
+        
+        logger.debug("✅ Successfully parsed resume and job data")
+        return resume_data, job_data
     
     def _get_file_path(self, resume_file) -> str:
         """Extract file path from resume file object"""
@@ -122,76 +489,62 @@ class CoverLetterGenerator:
         if not isinstance(job_data, dict):
             raise ValueError(f"Invalid job data structure: {type(job_data)}")
     
-    def _generate_with_ai(self, resume_data: Dict, job_data: Dict) -> str:
-        """Generate cover letter using AI with tools"""
-        generation_prompt = self._create_generation_prompt(resume_data, job_data)
+    async def _generate_with_ai(self, resume: ResumeData, job: JobData) -> AsyncIterator[str]:
+        """Generate cover letter using AI, yielding text as it streams in"""
+        generation_prompt = self._create_generation_prompt(resume, job)
         
         messages = [
             {"role": "system", "content": SYSTEM_MESSAGE},
             {"role": "user", "content": generation_prompt}
         ]
         
-        # Use tools to enhance the generation
-        response = self.openai_client.chat.completions.create(
+        stream = await self.openai_client.chat.completions.create(
             model=MODEL,
             messages=messages,
-            tools=self.tools,
-            tool_choice="auto",
             temperature=0.7,
-            timeout=45  # 45 second timeout for cover letter generation
+            stream=True
         )
         
-        # Handle tool calls if any
-        message = response.choices[0].message
-        if message.tool_calls:
-            messages.append(message)
-            
-            for tool_call in message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                # Execute the tool function and create response
-                if function_name == "analyze_resume_match":
-                    result = self._analyze_resume_match(resume_data, job_data)
-                elif function_name == "identify_key_selling_points":
-                    result = self._identify_selling_points(resume_data, job_data)
-                else:
-                    result = "Unknown function"
-                
-                # Add tool response message
-                messages.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": result
-                })
-            
-            # Get final response after tool usage
-            response = self.openai_client.chat.completions.create(
-                model=MODEL,
-                messages=messages,
-                temperature=0.7,
-                timeout=45  # 45 second timeout
-            )
-        
-        return response.choices[0].message.content
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
     
-    def _create_generation_prompt(self, resume_data: Dict, job_data: Dict) -> str:
+    def _create_generation_prompt(self, resume: ResumeData, job: JobData) -> str:
         """Create the generation prompt with resume and job data"""
+        # The match analysis is cheap and local, so it is computed up front
+        # instead of being offered to the model as tools, which would cost a
+        # second completion whenever the model called them
+        match = self._analyze_resume_match(resume, job)
+        selling_points = self._identify_selling_points(resume, job)
+        
+        return GENERATION_PROMPT_TEMPLATE.format(
+            name=resume.name or 'N/A',
+            skills=', '.join(resume.skills),
+            experience_count=len(resume.experience),
+            education=resume.education,
+            company_name=job.company_name or 'N/A',
+            job_title=job.job_title or 'N/A',
+            required_skills=', '.join(job.required_skills),
+            key_responsibilities=', '.join(job.key_responsibilities),
+            match=match,
+            selling_points=selling_points
+        )
+    
+    def _create_fused_prompt(self, resume: ResumeData, job_description: str) -> str:
+        """Create a prompt that analyzes the job description and writes the cover letter in one response"""
         return f"""
-        Create a professional, personalized cover letter based on the following information:
+        First analyze the job description below: identify the company, the position,
+        the required skills and the key responsibilities. Then use that analysis to
+        create a professional, personalized cover letter for the candidate.
         
         CANDIDATE INFORMATION:
-        Name: {resume_data.get('name', 'N/A')}
-        Skills: {', '.join(resume_data.get('skills', []))}
-        Experience: {len(resume_data.get('experience', []))} positions
-        Education: {resume_data.get('education', [])}
+        Name: {resume.name or 'N/A'}
+        Skills: {', '.join(resume.skills)}
+        Experience: {len(resume.experience)} positions
+        Education: {resume.education}
         
-        JOB INFORMATION:
-        Company: {job_data.get('company_name', 'N/A')}
-        Position: {job_data.get('job_title', 'N/A')}
-        Required Skills: {', '.join(job_data.get('required_skills', []))}
-        Key Responsibilities: {', '.join(job_data.get('key_responsibilities', []))}
+        JOB DESCRIPTION:
+        {job_description}
         
         REQUIREMENTS:
         1. Write in professional, engaging tone
@@ -203,18 +556,21 @@ class CoverLetterGenerator:
         7. Address the hiring manager professionally
         8. End with a strong call to action
         
-        Format the cover letter in markdown with proper headers and structure.
+        Return the analysis in "job_analysis" and the cover letter, formatted in
+        markdown with proper headers and structure, in "cover_letter".
         """
     
-    def _add_metadata(self, cover_letter: str, resume_data: Dict, job_data: Dict) -> str:
+    def _add_metadata(self, cover_letter: str, resume: ResumeData, job: JobData) -> str:
         """Add metadata header to the cover letter"""
-        try:
-            # Safely extract data with proper fallbacks
-            job_title = job_data.get('job_title', 'Position') if isinstance(job_data, dict) else 'Position'
-            company_name = job_data.get('company_name', 'Company') if isinstance(job_data, dict) else 'Company'
-            candidate_name = resume_data.get('name', 'Candidate') if isinstance(resume_data, dict) else 'Candidate'
-            
-            metadata = f"""# Cover Letter for {job_title} at {company_name}
+        return self._create_metadata_header(resume, job) + cover_letter
+    
+    def _create_metadata_header(self, resume: ResumeData, job: JobData) -> str:
+        """Create the metadata header placed above the cover letter"""
+        job_title = job.job_title or 'Position'
+        company_name = job.company_name or 'Company'
+        candidate_name = resume.name or 'Candidate'
+        
+        return f"""# Cover Letter for {job_title} at {company_name}
 
 **Generated for:** {candidate_name}  
 **Date:** {self._get_current_date()}  
@@ -224,21 +580,16 @@ class CoverLetterGenerator:
 ---
 
 """
-            return metadata + cover_letter
-        except Exception as e:
-            # If metadata fails, return just the cover letter
-            print(f"❌ Metadata error: {str(e)}")
-            return cover_letter
-    
-    def _analyze_resume_match(self, resume_data: Dict, job_data: Dict) -> str:
-        """Tool function to analyze resume-job match"""
-        return f"Resume match analysis: {len(resume_data.get('skills', []))} skills align with job requirements"
-    
-    def _identify_selling_points(self, resume_data: Dict, job_data: Dict) -> str:
-        """Tool function to identify key selling points"""
-        skills = resume_data.get('skills', [])
-        required_skills = job_data.get('required_skills', [])
-        matching_skills = [skill for skill in skills if any(req in skill.lower() for req in [req.lower() for req in required_skills])]
+    
+    def _analyze_resume_match(self, resume: ResumeData, job: JobData) -> str:
+        """Summarize how well the resume matches the job requirements"""
+        return f"Resume match analysis: {len(resume.skills)} skills align with job requirements"
+    
+    def _identify_selling_points(self, resume: ResumeData, job: JobData) -> str:
+        """Identify the candidate's key selling points for the job"""
+        # Lowercase the requirements once instead of once per resume skill
+        required_skills = {req.lower() for req in job.required_skills}
+        matching_skills = [skill for skill in resume.skills if any(req in skill.lower() for req in required_skills)]
         return f"Key selling points: {', '.join(matching_skills[:3])}"
     
     def _get_current_date(self) -> str:
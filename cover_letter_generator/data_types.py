@@ -5,42 +5,62 @@ This module contains all type hints and data structures used throughout the appl
 This makes the code more readable and helps with IDE support and learning.
 """
 
+import enum
 from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 
+# The data classes use __slots__ (no per-instance __dict__, faster attribute
+# access) and are frozen, so a result can't be changed once it is built.
+# Build a modified copy with dataclasses.replace() instead.
 
-@dataclass
+
+def _known_fields(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the keys of a parsed dict that are fields of cls, dropping missing (None) values."""
+    return {f.name: data[f.name] for f in fields(cls) if data.get(f.name) is not None}
+
+
+@dataclass(slots=True, frozen=True)
 class ResumeData:
     """Structured resume data extracted from uploaded files."""
-    name: str
-    email: str
-    phone: str
-    location: str
-    summary: str
-    skills: List[str]
-    experience: List[Dict[str, Any]]
-    education: List[Dict[str, Any]]
-    certifications: List[str]
-    achievements: List[str]
-
-
-@dataclass
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    summary: str = ""
+    skills: List[str] = field(default_factory=list)
+    experience: List[Dict[str, Any]] = field(default_factory=list)
+    education: List[Dict[str, Any]] = field(default_factory=list)
+    certifications: List[str] = field(default_factory=list)
+    achievements: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeData":
+        """Build from parsed resume JSON, ignoring unknown keys and defaulting missing ones."""
+        return cls(**_known_fields(cls, data))
+
+
+@dataclass(slots=True, frozen=True)
 class JobData:
     """Structured job description data extracted from text."""
-    company_name: str
-    job_title: str
-    required_skills: List[str]
-    preferred_skills: List[str]
-    experience_requirements: str
-    education_requirements: str
-    key_responsibilities: List[str]
-    company_culture: str
-    benefits: List[str]
-    location: str
-    employment_type: str
-
-
-@dataclass
+    company_name: str = ""
+    job_title: str = ""
+    required_skills: List[str] = field(default_factory=list)
+    preferred_skills: List[str] = field(default_factory=list)
+    experience_requirements: str = ""
+    education_requirements: str = ""
+    key_responsibilities: List[str] = field(default_factory=list)
+    company_culture: str = ""
+    benefits: List[str] = field(default_factory=list)
+    location: str = ""
+    employment_type: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobData":
+        """Build from parsed job analysis JSON, ignoring unknown keys and defaulting missing ones."""
+        return cls(**_known_fields(cls, data))
+
+
+@dataclass(slots=True, frozen=True)
 class ProcessingResult:
     """Result of cover letter generation process."""
     success: bool
@@ -48,6 +68,16 @@ class ProcessingResult:
     error_message: Optional[str] = None
 
 
+class Status(enum.IntEnum):
+    """Outcome of a cover letter request, reported alongside its content."""
+    OK = 0
+    VALIDATION = 1  # Missing or invalid inputs
+    FILE = 2  # The resume file couldn't be read
+    GENERATION = 3  # Parsing, analysis or writing the letter failed
+    TIMEOUT = 4  # The whole generation ran past its deadline
+    UNEXPECTED = 5
+
+
 # Type aliases for better readability
 FileType = str  # "pdf", "docx", or "text"
 ProgressCallback = Any  # Gradio Progress object
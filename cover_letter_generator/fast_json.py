@@ -0,0 +1,26 @@
+# Fast JSON Module
+# Parses JSON with orjson when it is installed, falling back to the standard library
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional; json from the standard library is used instead
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+    
+    orjson parses in native code and is several times faster than json for
+    the AI responses and batch results parsed here.
+    
+    Raises:
+        json.JSONDecodeError: If the document is invalid (orjson's error is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
@@ -2,62 +2,76 @@
 # Handles parsing and analyzing job descriptions
 
 import json
-import re
-from typing import Dict, Any
-from openai import OpenAI
+import logging
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
+import fast_json
 from config import (
-    MODEL, JOB_ANALYSIS_PROMPT, JOB_TEMPLATE, 
-    FALLBACK_JOB_DATA, OPENAI_API_KEY
+    MODEL, JOB_ANALYSIS_PROMPT, JOB_TEMPLATE_JSON, 
+    FALLBACK_JOB_DATA, get_openai_client
 )
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
 
 class JobAnalyzer:
     """Tool for analyzing job descriptions"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, openai_client: Optional["AsyncOpenAI"] = None):
+        self.openai_client = openai_client or get_openai_client()
     
-    def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
+    async def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
         """Analyze job description and extract key requirements"""
         try:
-            analysis_prompt = f"""
+            response = await self.openai_client.chat.completions.create(
+                model=MODEL,
+                messages=self.build_messages(job_description),
+                response_format={"type": "json_object"},
+                temperature=0.1
+            )
+            
+            return self.parse_analysis(response.choices[0].message.content)
+        
+        except Exception as e:
+            logger.error("❌ Job analysis error: %s", e)
+            return {"error": f"Failed to analyze job description: {str(e)}"}
+    
+    def build_messages(self, job_description: str) -> List[Dict[str, str]]:
+        """Build the chat messages used to analyze a job description"""
+        analysis_prompt = f"""
             Analyze this job description and extract the following information in JSON format:
             
-            {json.dumps(JOB_TEMPLATE, indent=2)}
+            {JOB_TEMPLATE_JSON}
             
             Job Description:
             {job_description}
             
             Return only valid JSON, no additional text.
             """
-            
-            response = self.openai_client.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": JOB_ANALYSIS_PROMPT},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                temperature=0.1,
-                timeout=30  # 30 second timeout
-            )
-            
-            # Parse JSON response
-            json_str = response.choices[0].message.content.strip()
-            print(f"🔍 Job Analysis AI Response: {json_str[:200]}...")  # Debug output
-            
-            json_str = re.sub(r'```json\s*', '', json_str)
-            json_str = re.sub(r'```\s*$', '', json_str)
-            
-            try:
-                job_data = json.loads(json_str)
-                print(f"✅ Successfully parsed job data: {list(job_data.keys())}")
-                return job_data
-            except json.JSONDecodeError as json_err:
-                print(f"❌ Job analysis JSON parsing error: {json_err}")
-                print(f"❌ Problematic JSON string: {json_str}")
-                return FALLBACK_JOB_DATA
-            
-        except Exception as e:
-            print(f"❌ Job analysis error: {str(e)}")
-            return {"error": f"Failed to analyze job description: {str(e)}"}
+        
+        return [
+            {"role": "system", "content": JOB_ANALYSIS_PROMPT},
+            {"role": "user", "content": analysis_prompt}
+        ]
+    
+    def parse_analysis(self, content: str) -> Dict[str, Any]:
+        """
+        Parse the AI response into job data, falling back on invalid JSON.
+        
+        The response is requested in JSON mode, so the only invalid JSON is
+        a response cut short.
+        """
+        # Parse JSON response
+        logger.debug("🔍 Job Analysis AI Response: %.200s...", content)
+        
+        try:
+            job_data = fast_json.loads(content)
+            logger.debug("✅ Successfully parsed job data: %s", list(job_data))
+            return job_data
+        except json.JSONDecodeError as json_err:
+            logger.error("❌ Job analysis JSON parsing error: %s", json_err)
+            logger.debug("❌ Problematic JSON string: %s", content)
+            return FALLBACK_JOB_DATA
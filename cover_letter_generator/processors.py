@@ -4,12 +4,62 @@ Core processing logic for the Cover Letter Generator.
 This module contains the main business logic, separated from UI concerns.
 """
 
-from typing import Tuple, Optional
+import asyncio
+import csv
+import logging
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List, Tuple, Optional
 import gradio as gr
 
-from data_types import ResumeFile, FileType, ProcessingResult
-from validators import validate_inputs, detect_file_type, validate_file_size
-from cover_letter_generator import CoverLetterGenerator
+from data_types import ResumeFile, FileType, ProcessingResult, Status
+from validators import (
+    validate_inputs, validate_batch_inputs, detect_file_type, validate_file_size, validate_file_contents
+)
+from cover_letter_generator import CoverLetterGenerator, GenerationError
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Upper bound in seconds on a whole cover letter generation. Each OpenAI
+# request also has its own timeout, but a run makes several of them.
+GENERATION_TIMEOUT = 90
+
+# Loading message shown while a cover letter is being generated
+LOADING_HTML = "<div style='text-align: center; padding: 20px; font-size: 18px; color: #007bff;'>🔍 Analyzing - this may take a few minutes...</div>"
+
+# Update that hides the loading message, sent with every streamed chunk. One
+# instance is shared since it carries no value: Gradio pops "value" out of the
+# update dicts it processes, so updates with a value are built per call
+_HIDE_LOADING = gr.update(visible=False)
+
+# Cover letters process_many writes at once; keeps a large set of resumes
+# under the OpenAI rate limits
+MAX_CONCURRENT_LETTERS = 8
+
+
+async def _with_deadline(stream: AsyncGenerator[str, None], timeout: float) -> AsyncIterator[str]:
+    """
+    Re-yield items from an async stream until a deadline passes.
+    
+    Only the time spent waiting on the stream counts towards the deadline,
+    not the time the caller spends handling each item. The wrapped stream
+    is always closed, so a timeout also releases its open API response.
+    
+    Raises:
+        asyncio.TimeoutError: If the stream is not exhausted in time
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(anext(stream), deadline - loop.time())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        await stream.aclose()
 
 
 class CoverLetterProcessor:
@@ -19,9 +69,34 @@ class CoverLetterProcessor:
     This class handles the complete workflow from input validation to output generation.
     """
     
-    def __init__(self):
-        """Initialize the processor with a cover letter generator."""
-        self.generator = CoverLetterGenerator()
+    def __init__(self, openai_client: Optional["AsyncOpenAI"] = None):
+        """
+        Initialize the processor with a cover letter generator.
+        
+        Args:
+            openai_client: Optional async OpenAI client to share with other callers.
+                The shared client from config is used when not provided.
+        """
+        self.generator = CoverLetterGenerator(openai_client)
+        self._warmed_up = False
+    
+    async def warm_up(self) -> None:
+        """
+        Open a connection to OpenAI ahead of the first request.
+        
+        Runs once per process; later calls return immediately. The request is
+        made on Gradio's event loop, which is where the pooled connection
+        will be reused.
+        """
+        if self._warmed_up:
+            return
+        self._warmed_up = True
+        
+        try:
+            await self.generator.openai_client.models.list()
+            logger.info("🔌 OpenAI connection ready")
+        except Exception as e:
+            logger.warning("⚠️ Could not warm up the OpenAI connection: %s", e)
     
     def show_loading_status(self) -> Tuple[gr.update, gr.update]:
         """
@@ -30,10 +105,7 @@ class CoverLetterProcessor:
         Returns:
             Tuple of (loading_status_update, cover_letter_clear_update)
         """
-        loading_update = gr.update(
-            visible=True, 
-            value="<div style='text-align: center; padding: 20px; font-size: 18px; color: #007bff;'>🔍 Analyzing - this may take a few minutes...</div>"
-        )
+        loading_update = gr.update(visible=True, value=LOADING_HTML)
         cover_letter_clear = gr.update(value="")
         return loading_update, cover_letter_clear
     
@@ -44,44 +116,63 @@ class CoverLetterProcessor:
         Returns:
             Gradio update object to hide loading message
         """
-        return gr.update(visible=False)
+        return _HIDE_LOADING
     
-    def process_cover_letter(
+    async def process_cover_letter(
         self, 
         resume_file: ResumeFile, 
         job_description: str, 
         file_type: FileType,
         progress: Optional[gr.Progress] = None
-    ) -> Tuple[str, gr.update]:
+    ) -> AsyncIterator[Tuple[str, gr.update]]:
         """
         Process cover letter generation with comprehensive error handling.
         
         This method orchestrates the entire cover letter generation process:
         1. Validates inputs
         2. Detects file type
-        3. Validates file size
+        3. Validates file size and contents
         4. Generates cover letter
-        5. Returns result with proper error handling
+        5. Streams the result with proper error handling
+        
+        It is an async generator: Gradio re-renders the output on every yield,
+        so the letter appears while it is being written instead of all at the
+        end, and the event loop stays free to serve other requests while this
+        one waits on the AI.
         
         Args:
             resume_file: The uploaded resume file
             job_description: The job description text
             file_type: User-specified file type or "auto"
             progress: Optional Gradio progress callback
-            
-        Returns:
-            Tuple of (result_content, loading_status_update)
-            
+        
+        Yields:
+            Tuples of (result_content_so_far, loading_status_update)
+        
         Examples:
             >>> processor = CoverLetterProcessor()
-            >>> result, status = processor.process_cover_letter(file, "Software Engineer", "auto")
+            >>> async for result, status in processor.process_cover_letter(file, "Software Engineer", "auto"):
+            ...     pass
             >>> print(result[:50])
             "# Cover Letter for Software Engineer at Company"
         """
+        hide_loading = self.hide_loading_status()
+        async for _, content in self._process_cover_letter(resume_file, job_description, file_type, progress):
+            yield content, hide_loading
+    
+    async def _process_cover_letter(
+        self,
+        resume_file: ResumeFile,
+        job_description: str,
+        file_type: FileType,
+        progress: Optional[gr.Progress] = None
+    ) -> AsyncIterator[Tuple[Status, str]]:
+        """Run the steps of process_cover_letter, yielding (status, result_content_so_far)"""
         # Step 1: Validate inputs
         is_valid, error_message = validate_inputs(resume_file, job_description)
         if not is_valid:
-            return error_message, self.hide_loading_status()
+            yield Status.VALIDATION, error_message
+            return
         
         try:
             # Step 2: Show loading animation
@@ -91,35 +182,204 @@ class CoverLetterProcessor:
             # Step 3: Detect file type
             detected_file_type = detect_file_type(resume_file.name, file_type)
             
-            # Step 4: Validate file size
+            # Step 4: Validate file size and contents
             is_size_valid, size_error = validate_file_size(resume_file.name)
             if not is_size_valid:
-                return size_error, self.hide_loading_status()
+                yield Status.VALIDATION, size_error
+                return
+            
+            is_content_valid, content_error = validate_file_contents(resume_file.name, detected_file_type)
+            if not is_content_valid:
+                yield Status.VALIDATION, content_error
+                return
             
-            # Step 5: Generate cover letter
-            result = self.generator.generate_cover_letter(
+            # Step 5: Generate cover letter, streaming partial results
+            stream = self.generator.generate_cover_letter(
                 resume_file, 
                 job_description, 
                 detected_file_type, 
                 progress
             )
+            async for result in _with_deadline(stream, GENERATION_TIMEOUT):
+                yield Status.OK, result
+        
+        except GenerationError as e:
+            yield Status.GENERATION, str(e)
+        
+        except asyncio.TimeoutError:
+            yield Status.TIMEOUT, f"❌ Cover letter generation timed out after {GENERATION_TIMEOUT} seconds. Please try again."
+        
+        except FileNotFoundError as e:
+            yield Status.FILE, f"❌ File not found: {str(e)}"
+        
+        except PermissionError as e:
+            yield Status.FILE, f"❌ Permission denied: {str(e)}"
+        
+        except Exception as e:
+            yield Status.UNEXPECTED, f"❌ Unexpected error: {str(e)}"
+    
+    async def process_many(
+        self,
+        items: List[Tuple[ResumeFile, str]],
+        file_type: FileType = "auto"
+    ) -> List[str]:
+        """
+        Generate cover letters for many (resume, job description) pairs concurrently.
+        
+        Each letter spends nearly all of its time waiting on OpenAI, so
+        running them together takes about as long as the slowest one. At
+        most MAX_CONCURRENT_LETTERS are generated at a time.
+        
+        Args:
+            items: Pairs of (resume_file, job_description)
+            file_type: User-specified file type or "auto"
+        
+        Returns:
+            The final result for each pair, in order (a cover letter or an error message)
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LETTERS)
+        
+        async def generate(resume_file: ResumeFile, job_description: str) -> str:
+            async with semaphore:
+                _, content = await self._final_result(resume_file, job_description, file_type)
+                return content
+        
+        results = await asyncio.gather(
+            *[generate(resume_file, job_description) for resume_file, job_description in items],
+            return_exceptions=True
+        )
+        return [
+            f"❌ Unexpected error: {str(result)}" if isinstance(result, Exception) else result
+            for result in results
+        ]
+    
+    async def process_resumes(
+        self,
+        resume_files: Optional[List[ResumeFile]],
+        job_description: str,
+        file_type: FileType
+    ) -> str:
+        """
+        Generate a cover letter for each uploaded resume against one job description.
+        
+        Args:
+            resume_files: The uploaded resume files
+            job_description: The job description text
+            file_type: User-specified file type or "auto"
+        
+        Returns:
+            All generated cover letters as one markdown document
+        """
+        if not resume_files:
+            return "❌ Please upload at least one resume file."
+        
+        results = await self.process_many(
+            [(resume_file, job_description) for resume_file in resume_files],
+            file_type
+        )
+        return "\n\n---\n\n".join(results)
+    
+    async def process_batch(
+        self,
+        resume_file: ResumeFile,
+        jobs_file: ResumeFile,
+        file_type: FileType,
+        progress: gr.Progress = gr.Progress()
+    ) -> str:
+        """
+        Generate cover letters for every job description in a CSV file.
+        
+        The requests go through the OpenAI Batch API, which halves the token
+        cost but may take a long time to finish, so this suits bulk runs rather
+        than interactive use. Progress is driven by the batch status.
+        
+        Args:
+            resume_file: The uploaded resume file
+            jobs_file: CSV file with one job description per row
+            file_type: User-specified file type or "auto"
+            progress: Gradio progress tracker (injected by Gradio)
+        
+        Returns:
+            All generated cover letters as one markdown document
+        """
+        # Step 1: Validate inputs
+        is_valid, error_message = validate_batch_inputs(resume_file, jobs_file)
+        if not is_valid:
+            return error_message
+        
+        try:
+            # Step 2: Validate the resume
+            detected_file_type = detect_file_type(resume_file.name, file_type)
+            is_size_valid, size_error = validate_file_size(resume_file.name)
+            if not is_size_valid:
+                return size_error
             
-            # Step 6: Return success result
-            return result, self.hide_loading_status()
+            is_content_valid, content_error = validate_file_contents(resume_file.name, detected_file_type)
+            if not is_content_valid:
+                return content_error
             
-        except FileNotFoundError as e:
-            error_msg = f"❌ File not found: {str(e)}"
-            return error_msg, self.hide_loading_status()
+            # Step 3: Read job descriptions
+            job_descriptions = self._read_job_descriptions(jobs_file.name)
+            if not job_descriptions:
+                return "❌ No job descriptions found in the CSV file."
             
-        except PermissionError as e:
-            error_msg = f"❌ Permission denied: {str(e)}"
-            return error_msg, self.hide_loading_status()
+            # Step 4: Generate all cover letters as a batch
+            progress(0, desc="📤 Submitting batch...")
+            results = await self.generator.generate_cover_letters_batch(
+                resume_file,
+                job_descriptions,
+                detected_file_type,
+                on_status=lambda status, completed, total: progress(
+                    completed / total if total else 0,
+                    desc=f"{status}: {completed}/{total}"
+                )
+            )
             
+            return "\n\n---\n\n".join(results)
+        
+        except FileNotFoundError as e:
+            return f"❌ File not found: {str(e)}"
+        
+        except PermissionError as e:
+            return f"❌ Permission denied: {str(e)}"
+        
         except Exception as e:
-            error_msg = f"❌ Unexpected error: {str(e)}"
-            return error_msg, self.hide_loading_status()
+            return f"❌ Unexpected error: {str(e)}"
     
-    def get_processing_result(
+    def _read_job_descriptions(self, csv_path: str) -> List[str]:
+        """
+        Read job descriptions from a CSV file.
+        
+        Uses the "job_description" column when the file has that header,
+        otherwise the first column of every row.
+        """
+        with open(csv_path, newline='', encoding='utf-8') as csv_file:
+            rows = [row for row in csv.reader(csv_file) if row]
+        
+        if not rows:
+            return []
+        
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = 0
+        if "job_description" in header:
+            column = header.index("job_description")
+            rows = rows[1:]
+        
+        return [row[column].strip() for row in rows if len(row) > column and row[column].strip()]
+    
+    async def _final_result(
+        self,
+        resume_file: ResumeFile,
+        job_description: str,
+        file_type: FileType
+    ) -> Tuple[Status, str]:
+        """Run a cover letter request to the end and return its last (complete) update"""
+        status, content = Status.UNEXPECTED, ""
+        async for status, content in self._process_cover_letter(resume_file, job_description, file_type):
+            pass
+        return status, content
+    
+    async def get_processing_result(
         self, 
         resume_file: ResumeFile, 
         job_description: str, 
@@ -137,18 +397,17 @@ class CoverLetterProcessor:
             ProcessingResult object with success status and content/error
         """
         try:
-            content, _ = self.process_cover_letter(resume_file, job_description, file_type)
+            status, content = await self._final_result(resume_file, job_description, file_type)
             
-            # Check if content starts with error indicators
-            if content.startswith("❌") or content.startswith("Error"):
+            if status is Status.OK:
                 return ProcessingResult(
-                    success=False,
-                    error_message=content
+                    success=True,
+                    content=content
                 )
             else:
                 return ProcessingResult(
-                    success=True,
-                    content=content
+                    success=False,
+                    error_message=content
                 )
                 
         except Exception as e:
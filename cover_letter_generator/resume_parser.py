@@ -1,81 +1,352 @@
 # Resume Parser Module
 # Handles parsing and extracting information from resume files
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
 import re
-from typing import Dict, Any
-import PyPDF2
-from docx import Document
-from openai import OpenAI
+import shutil
+import subprocess
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
 
+import fast_json
 from config import (
-    MODEL, RESUME_ANALYSIS_PROMPT, RESUME_TEMPLATE, 
-    FALLBACK_RESUME_DATA, OPENAI_API_KEY
+    MODEL, MAX_RESUME_TOKENS, RESUME_ANALYSIS_PROMPT, RESUME_TEMPLATE, RESUME_TEMPLATE_JSON, 
+    FALLBACK_RESUME_DATA, get_openai_client
 )
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Characters of resume text sent to the AI when tiktoken isn't installed (see
+# MAX_RESUME_TOKENS)
+MAX_RESUME_CHARS = 10000
+
+# Characters extracted from a PDF before the remaining pages are skipped. Twice
+# the character limit, so text with few tokens per character still fills the
+# token budget
+PDF_EXTRACT_CHARS = 2 * MAX_RESUME_CHARS
+
+# Number of extracted resume texts kept in memory
+TEXT_CACHE_SIZE = 32
+
+# Number of AI analyses kept in memory, keyed by the extracted resume text
+ANALYSIS_CACHE_SIZE = 64
+
+# Poppler's pdftotext binary, looked up once; None when it isn't installed
+PDFTOTEXT = shutil.which("pdftotext")
+
+# Seconds to wait for pdftotext before falling back to PyPDF2
+PDFTOTEXT_TIMEOUT = 15
+
+# A resume section heading at the start of a line, e.g. "WORK EXPERIENCE",
+# "Employment History" or "Skills:". Only a few known words may follow the
+# section name, so narrative lines such as "Projects I led..." don't match.
+# Text after a colon ("Skills: Python, SQL") is captured as "inline" and
+# belongs to the section
+SECTION_HEADING = re.compile(
+    r'(?im)^[ \t]*(?:professional[ \t]+|work[ \t]+|technical[ \t]+|key[ \t]+)?'
+    r'(summary|profile|experience|employment|education|skills|projects|certifications|achievements)'
+    r'(?:[ \t]+(?:&|and|history|experience|skills|training|qualifications|summary|projects|licenses|awards)){0,3}'
+    r'[ \t]*(?::[ \t]*(?P<inline>.*))?$'
+)
+
+# Resume template fields extracted from each section. "contact" is the text
+# above the first heading, where the name and contact details usually are
+SECTION_FIELDS = {
+    "contact": ("name", "email", "phone", "location", "summary"),
+    "summary": ("summary",),
+    "profile": ("summary",),
+    "experience": ("experience",),
+    "employment": ("experience",),
+    "education": ("education",),
+    "skills": ("skills",),
+    "projects": ("achievements",),
+    "certifications": ("certifications",),
+    "achievements": ("achievements",),
+}
+
+# The slice of the resume template sent along with each section
+SECTION_TEMPLATES_JSON = {
+    section: json.dumps({field: RESUME_TEMPLATE[field] for field in fields}, indent=2)
+    for section, fields in SECTION_FIELDS.items()
+}
+
+# Sections that must be found for the resume to be analyzed section by
+# section; otherwise it is sent whole
+REQUIRED_SECTIONS = {"experience", "skills"}
+
+
+def extract_section_snippets(text: str) -> Dict[str, str]:
+    """
+    Split resume text into its sections.
+    
+    Args:
+        text: Extracted resume text
+    
+    Returns:
+        Section text keyed by section name (see SECTION_FIELDS). Sections
+        that appear more than once are joined together.
+    """
+    snippets: Dict[str, List[str]] = {}
+    start, section = 0, "contact"
+    for heading in SECTION_HEADING.finditer(text):
+        snippets.setdefault(section, []).append(text[start:heading.start()])
+        # Text after an inline heading ("Skills: Python, SQL") starts the section
+        start = heading.start("inline") if heading.group("inline") else heading.end()
+        section = heading.group(1).lower()
+    snippets.setdefault(section, []).append(text[start:])
+    
+    return {
+        name: snippet
+        for name, parts in snippets.items()
+        if (snippet := "\n".join(parts).strip())
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Return the model's tiktoken encoding, or None when tiktoken isn't available"""
+    try:
+        import tiktoken  # Optional; imported on first use since loading an encoding is slow
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # e.g. the encoding file can't be downloaded
+        logger.warning("⚠️ Could not load the tiktoken encoding, truncating by characters: %s", e)
+        return None
+
+
+def truncate_resume_text(text: str) -> str:
+    """
+    Truncate resume text to what is sent to the AI.
+    
+    Counts real tokens with tiktoken when it is installed, so dense text
+    can't overrun the budget and sparse text isn't cut short; otherwise
+    falls back to MAX_RESUME_CHARS characters.
+    
+    Args:
+        text: Extracted resume text
+    
+    Returns:
+        The text, with "..." appended if it was truncated
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) > MAX_RESUME_TOKENS:
+            logger.info("⚠️ Resume text truncated to %d tokens", MAX_RESUME_TOKENS)
+            return encoding.decode(tokens[:MAX_RESUME_TOKENS]) + "..."
+        return text
+    
+    if len(text) > MAX_RESUME_CHARS:
+        logger.info("⚠️ Resume text truncated to %d characters", MAX_RESUME_CHARS)
+        return text[:MAX_RESUME_CHARS] + "..."
+    return text
+
+
+def _collect_pages(page_texts: Iterable[str], max_chars: Optional[int]) -> List[str]:
+    """
+    Collect page texts until at least max_chars characters are gathered.
+    
+    page_texts is consumed lazily, so pages past the budget are never
+    extracted. With max_chars None every page is collected.
+    """
+    collected: List[str] = []
+    total = 0
+    for text in page_texts:
+        collected.append(text)
+        total += len(text)
+        if max_chars is not None and total >= max_chars:
+            break
+    return collected
+
+
+def _merge_sections(sections: List[str], fragments: List[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Merge the per-section analyses into one resume; lists are combined, the first non-empty text wins.
+    
+    Returns None when the split looks wrong: a fragment isn't a JSON object,
+    or the required sections produced nothing.
+    """
+    if not all(isinstance(fragment, dict) for fragment in fragments):
+        return None
+    
+    merged: Dict[str, Any] = {}
+    for section, fragment in zip(sections, fragments):
+        for field in SECTION_FIELDS[section]:
+            value = fragment.get(field)
+            if isinstance(value, list):
+                existing = merged.setdefault(field, [])
+                if isinstance(existing, list):
+                    existing.extend(value)
+            elif value and not merged.get(field):
+                merged[field] = value
+    
+    if not all(merged.get(field) for section in REQUIRED_SECTIONS for field in SECTION_FIELDS[section]):
+        return None
+    return merged
+
 
 class ResumeParser:
     """Tool for parsing and analyzing resume content"""
     
-    def __init__(self):
+    def __init__(self, openai_client: Optional["AsyncOpenAI"] = None):
         self.parsed_data = {}
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        self.openai_client = openai_client or get_openai_client()
+        # Extracted text keyed by (sha256 of file bytes, file type)
+        self._text_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        # AI analyses keyed by sha256 of (model, resume text)
+        self._analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
     
-    def extract_text_from_pdf(self, pdf_file) -> str:
-        """Extract text from PDF file"""
+    def extract_text_from_pdf(self, pdf_file, max_chars: Optional[int] = None) -> str:
+        """
+        Extract text from PDF file (a path or a binary file object).
+        
+        PyMuPDF does the extraction in native code and is much faster than
+        PyPDF2. Without it, Poppler's pdftotext is used when it is on the
+        PATH, and PyPDF2 only as the last resort.
+        
+        With max_chars set, PyMuPDF and PyPDF2 stop reading pages once that
+        much text has been extracted; the result may still run past it, up to
+        the end of the last page read.
+        """
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            # Imported on first use; only PDF uploads need them
+            try:
+                import fitz
+            except ImportError:
+                if PDFTOTEXT and isinstance(pdf_file, str):
+                    text = self._extract_text_from_pdf_pdftotext(pdf_file)
+                    if text is not None:
+                        return text
+                return self._extract_text_from_pdf_pypdf2(pdf_file, max_chars)
+            
+            if isinstance(pdf_file, str):
+                doc = fitz.open(pdf_file)
+            else:
+                doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
+            with doc:
+                return "\n".join(_collect_pages((page.get_text("text") for page in doc), max_chars))
         except Exception as e:
             return f"Error reading PDF: {str(e)}"
     
+    def _extract_text_from_pdf_pdftotext(self, pdf_path: str) -> Optional[str]:
+        """Extract text from a PDF file with pdftotext, returning None if it fails"""
+        try:
+            result = subprocess.run(
+                [PDFTOTEXT, "-q", "-enc", "UTF-8", pdf_path, "-"],
+                capture_output=True,
+                encoding="utf-8",
+                timeout=PDFTOTEXT_TIMEOUT
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("⚠️ pdftotext failed, falling back to PyPDF2: %s", e)
+            return None
+        
+        if result.returncode != 0:
+            logger.warning("⚠️ pdftotext exited with status %d, falling back to PyPDF2", result.returncode)
+            return None
+        return result.stdout
+    
+    def _extract_text_from_pdf_pypdf2(self, pdf_file, max_chars: Optional[int] = None) -> str:
+        """Extract text from PDF file with the pure-Python PyPDF2 reader"""
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        # Joined once at the end rather than grown page by page
+        page_texts = filter(None, (page.extract_text() for page in pdf_reader.pages))
+        return "\n".join(_collect_pages(page_texts, max_chars))
+    
     def extract_text_from_docx(self, docx_file) -> str:
         """Extract text from DOCX file"""
         try:
+            from docx import Document  # Imported on first use; only DOCX uploads need it
             doc = Document(docx_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            # Paragraph.text is rebuilt from its runs on every access, so it is
+            # read once per paragraph; empty paragraphs are left out
+            return "\n".join(filter(None, (paragraph.text for paragraph in doc.paragraphs)))
         except Exception as e:
             return f"Error reading DOCX: {str(e)}"
     
-    def parse_resume(self, resume_file_path: str, file_type: str) -> Dict[str, Any]:
+    def check_file_size(self, resume_file_path: str) -> Optional[str]:
+        """Return an error message if the resume file is too large, otherwise None"""
+        file_size = os.path.getsize(resume_file_path)
+        if file_size > 2 * 1024 * 1024:  # 2MB limit
+            logger.warning("⚠️ File too large: %d bytes (max 2MB)", file_size)
+            return "Resume file is too large. Please use a file smaller than 2MB."
+        return None
+    
+    async def extract_resume_text(self, resume_file_path: str, file_type: str) -> str:
+        """Extract the resume text, truncated to a length the AI handles quickly"""
+        # Extract text based on file type and limit its length to prevent API
+        # timeouts, off the event loop since PDF/DOCX parsing and token
+        # counting are blocking work
+        return await asyncio.to_thread(self._extract_truncated_text, resume_file_path, file_type)
+    
+    def _extract_truncated_text(self, file_path: str, file_type: str) -> str:
+        """Extract the resume text and truncate it (runs in a worker thread)"""
+        return truncate_resume_text(self._extract_resume_text_cached(file_path, file_type))
+    
+    async def parse_resume(self, resume_file_path: str, file_type: str) -> Dict[str, Any]:
         """Parse resume and extract structured information"""
         try:
             # Check file size (limit to 2MB)
-            import os
-            file_size = os.path.getsize(resume_file_path)
-            if file_size > 2 * 1024 * 1024:  # 2MB limit
-                print(f"⚠️ File too large: {file_size} bytes (max 2MB)")
-                return {"error": "Resume file is too large. Please use a file smaller than 2MB."}
-            
-            # Extract text based on file type
-            resume_text = self._extract_resume_text(resume_file_path, file_type)
+            size_error = self.check_file_size(resume_file_path)
+            if size_error:
+                return {"error": size_error}
             
-            # Limit text length to prevent API timeouts
-            if len(resume_text) > 10000:  # 10k character limit
-                resume_text = resume_text[:10000] + "..."
-                print(f"⚠️ Resume text truncated to 10,000 characters")
+            resume_text = await self.extract_resume_text(resume_file_path, file_type)
             
             # Use AI to analyze and structure the resume
-            structured_data = self._analyze_with_ai(resume_text)
+            structured_data = await self._analyze_with_ai(resume_text)
             
             self.parsed_data = structured_data
             return structured_data
             
         except Exception as e:
-            print(f"❌ Resume parsing error: {str(e)}")
+            logger.error("❌ Resume parsing error: %s", e)
             return {"error": f"Failed to parse resume: {str(e)}"}
     
+    def _extract_resume_text_cached(self, file_path: str, file_type: str) -> str:
+        """
+        Extract resume text, reusing earlier results for identical files.
+        
+        Re-generating a letter for the same resume skips the PDF/DOCX
+        extraction entirely; the cache is keyed by file content, not path.
+        """
+        with open(file_path, 'rb') as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        key = (digest, file_type.lower())
+        
+        if key in self._text_cache:
+            self._text_cache.move_to_end(key)
+            return self._text_cache[key]
+        
+        text = self._extract_resume_text(file_path, file_type)
+        
+        # Don't cache extraction failures
+        if not text.startswith(("Error reading PDF", "Error reading DOCX")):
+            self._text_cache[key] = text
+            if len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        
+        return text
+    
     def _extract_resume_text(self, file_path: str, file_type: str) -> str:
         """Extract text from resume file based on type"""
         if file_type.lower() == 'pdf':
-            with open(file_path, 'rb') as file:
-                return self.extract_text_from_pdf(file)
+            # Pages past what extract_resume_text keeps are not extracted at all
+            return self.extract_text_from_pdf(file_path, max_chars=PDF_EXTRACT_CHARS)
         elif file_type.lower() in ['docx', 'doc']:
             return self.extract_text_from_docx(file_path)
         else:
@@ -83,12 +354,63 @@ class ResumeParser:
             with open(file_path, 'r', encoding='utf-8') as file:
                 return file.read()
     
-    def _analyze_with_ai(self, resume_text: str) -> Dict[str, Any]:
-        """Use AI to analyze and structure resume content"""
+    async def _analyze_with_ai(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Use AI to analyze and structure resume content.
+        
+        Analyses are cached by resume text, so the same resume uploaded as a
+        different file (a re-export, a copy under another name) skips the
+        OpenAI round trip.
+        """
+        key = hashlib.sha256(f"{MODEL}|{resume_text}".encode("utf-8")).hexdigest()
+        if key in self._analysis_cache:
+            self._analysis_cache.move_to_end(key)
+            logger.debug("♻️ Using cached resume analysis")
+            return self._analysis_cache[key]
+        
+        try:
+            parsed_data = None
+            sections = extract_section_snippets(resume_text)
+            if REQUIRED_SECTIONS <= sections.keys():
+                # Each section is sent on its own, with only its slice of the
+                # template, and the requests run concurrently
+                names = list(sections)
+                fragments = await asyncio.gather(*[
+                    self._extract_fields(SECTION_TEMPLATES_JSON[name], sections[name])
+                    for name in names
+                ])
+                parsed_data = _merge_sections(names, fragments)
+                if parsed_data is None:
+                    logger.info("⚠️ Section analysis looked wrong, analyzing the whole resume")
+            
+            if parsed_data is None:
+                parsed_data = await self._extract_fields(RESUME_TEMPLATE_JSON, resume_text)
+        except json.JSONDecodeError as json_err:
+            logger.error("❌ JSON parsing error: %s", json_err)
+            return FALLBACK_RESUME_DATA
+        
+        logger.debug("✅ Successfully parsed resume data: %s", list(parsed_data))
+        
+        # Fallback data is never cached, so a failed parse is retried
+        self._analysis_cache[key] = parsed_data
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return parsed_data
+    
+    async def _extract_fields(self, template_json: str, resume_text: str) -> Dict[str, Any]:
+        """
+        Ask the AI to fill in a resume template from resume text.
+        
+        The response is requested in JSON mode, so it is a bare JSON object
+        rather than JSON wrapped in markdown.
+        
+        Raises:
+            json.JSONDecodeError: If the response is cut short before the JSON is complete
+        """
         analysis_prompt = f"""
         Analyze this resume and extract the following information in JSON format:
         
-        {json.dumps(RESUME_TEMPLATE, indent=2)}
+        {template_json}
         
         Resume text:
         {resume_text}
@@ -96,32 +418,22 @@ class ResumeParser:
         Return only valid JSON, no additional text.
         """
         
-        response = self.openai_client.chat.completions.create(
+        response = await self.openai_client.chat.completions.create(
             model=MODEL,
             messages=[
                 {"role": "system", "content": RESUME_ANALYSIS_PROMPT},
                 {"role": "user", "content": analysis_prompt}
             ],
-            temperature=0.1,
-            timeout=30  # 30 second timeout
+            response_format={"type": "json_object"},
+            temperature=0.1
         )
         
         # Parse JSON response
-        json_str = response.choices[0].message.content.strip()
-        print(f"🔍 AI Response: {json_str[:200]}...")  # Debug output
-        
-        # Clean up the response to ensure valid JSON
-        json_str = re.sub(r'```json\s*', '', json_str)
-        json_str = re.sub(r'```\s*$', '', json_str)
+        content = response.choices[0].message.content
+        logger.debug("🔍 AI Response: %.200s...", content)
         
         try:
-            parsed_data = json.loads(json_str)
-            print(f"✅ Successfully parsed resume data: {list(parsed_data.keys())}")
-            return parsed_data
-        except json.JSONDecodeError as json_err:
-            print(f"❌ JSON parsing error: {json_err}")
-            print(f"❌ Problematic JSON string: {json_str}")
-            return FALLBACK_RESUME_DATA
-        except Exception as e:
-            print(f"❌ Resume parsing error: {str(e)}")
-            return FALLBACK_RESUME_DATA
+            return fast_json.loads(content)
+        except json.JSONDecodeError:
+            logger.debug("❌ Problematic JSON string: %s", content)
+            raise
@@ -5,11 +5,15 @@ Web deployment script for Cover Letter Generator.
 This script provides different options for making the application accessible on the web.
 """
 
+import logging
+
 import gradio as gr
 from app import create_interface
 
 def main():
     """Launch the application with web access enabled."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("🚀 Starting Cover Letter Generator for Web Access...")
     print("📱 Creating Gradio interface...")
     
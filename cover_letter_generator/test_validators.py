@@ -10,9 +10,14 @@ This demonstrates:
 Run tests with: python -m pytest test_validators.py -v
 """
 
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock
-from validators import validate_inputs, detect_file_type, validate_file_size
+from validators import (
+    validate_inputs, validate_batch_inputs, detect_file_type, validate_file_size,
+    sniff_file_type, validate_file_contents
+)
 
 
 class TestValidators(unittest.TestCase):
@@ -64,6 +69,24 @@ class TestValidators(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertEqual(error_message, "❌ Please provide a job description.")
     
+    def test_validate_batch_inputs_with_valid_data(self):
+        """Test that a resume and a jobs CSV are accepted."""
+        # Act: Call with both files present
+        is_valid, error_message = validate_batch_inputs(Mock(), Mock())
+        
+        # Assert: Should be valid with no error
+        self.assertTrue(is_valid)
+        self.assertIsNone(error_message)
+    
+    def test_validate_batch_inputs_with_no_jobs_file(self):
+        """Test that a missing jobs CSV returns appropriate error."""
+        # Act: Call without a jobs file
+        is_valid, error_message = validate_batch_inputs(Mock(), None)
+        
+        # Assert: Should be invalid with error message
+        self.assertFalse(is_valid)
+        self.assertEqual(error_message, "❌ Please upload a CSV file of job descriptions.")
+    
     def test_detect_file_type_pdf(self):
         """Test PDF file type detection."""
         # Act & Assert: Test various PDF file names
@@ -112,6 +135,43 @@ class TestFileSizeValidation(unittest.TestCase):
         self.assertEqual(error_message, "❌ Could not read file size")
 
 
+class TestFileContentValidation(unittest.TestCase):
+    """Test cases for detecting and validating file contents."""
+    
+    def _write_temp_file(self, suffix, contents):
+        """Write contents to a temporary file that is removed after the test."""
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as file:
+            file.write(contents)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+    
+    def test_sniff_file_type(self):
+        """Test that PDF and DOCX files are recognized by their first bytes."""
+        self.assertEqual(sniff_file_type(self._write_temp_file(".bin", b"%PDF-1.7\n")), "pdf")
+        self.assertEqual(sniff_file_type(self._write_temp_file(".bin", b"PK\x03\x04rest")), "docx")
+        self.assertIsNone(sniff_file_type(self._write_temp_file(".txt", b"Jane Doe")))
+        self.assertIsNone(sniff_file_type("/nonexistent/file.pdf"))
+    
+    def test_detect_file_type_prefers_contents(self):
+        """Test that a misnamed file is detected by its contents."""
+        # Arrange: A PDF saved with a .txt extension
+        file_path = self._write_temp_file(".txt", b"%PDF-1.4\n")
+        
+        # Act & Assert
+        self.assertEqual(detect_file_type(file_path, "auto"), "pdf")
+    
+    def test_validate_file_contents(self):
+        """Test that a file that isn't really a PDF is rejected."""
+        # Arrange
+        fake_pdf = self._write_temp_file(".pdf", b"not a pdf")
+        real_pdf = self._write_temp_file(".pdf", b"%PDF-1.4\n")
+        
+        # Act & Assert
+        self.assertEqual(validate_file_contents(fake_pdf, "pdf"), (False, "❌ The file is not a valid PDF document."))
+        self.assertEqual(validate_file_contents(real_pdf, "pdf"), (True, None))
+        self.assertEqual(validate_file_contents(fake_pdf, "text"), (True, None))
+
+
 if __name__ == "__main__":
     # Run the tests
     unittest.main()
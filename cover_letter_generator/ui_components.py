@@ -4,24 +4,91 @@ UI components and styling for the Cover Letter Generator.
 This module contains all Gradio UI components and styling, keeping the main app clean.
 """
 
+import os
 import gradio as gr
 from typing import Tuple, Any
 
+# Stylesheet served from a file instead of an inline Python string
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
 
-def create_file_upload_section() -> Tuple[gr.File, gr.Dropdown]:
+# Static Markdown blocks, built once at import rather than on every
+# create_interface() call
+HEADER_MARKDOWN = """
+        # 🤖 AI-Powered Cover Letter Generator
+        
+        Upload your resume and paste a job description to generate a personalized, professional cover letter using advanced AI analysis.
+        
+        **Features:**
+        - 📄 Supports PDF, DOCX, and text files (max 2MB)
+        - 🔍 Intelligent resume and job description analysis
+        - ✍️ Personalized cover letter generation
+        - 🎯 Matches your skills to job requirements
+        - 📝 Professional formatting in markdown
+        - ⏱️ Optimized for fast processing with API timeouts
+        """
+
+BULK_INTRO_MARKDOWN = """
+    Generate a cover letter for every job in a CSV file (one job description per row,
+    optionally under a `job_description` header). Requests are sent through the OpenAI
+    Batch API at half the cost, but results can take a while to come back.
+    """
+
+MULTI_RESUME_INTRO_MARKDOWN = """
+    Generate a cover letter for each of several resumes against the same job description.
+    The letters are written at the same time, so this takes about as long as a single one.
+    """
+
+EXAMPLES_MARKDOWN = """
+        **Software Engineer Example:**
+        ```
+        Software Engineer - We are seeking a talented Software Engineer to join our team. 
+        Requirements: 3+ years Python experience, React, AWS, Docker. 
+        Responsibilities: Develop web applications, collaborate with team, maintain code quality.
+        ```
+        
+        **Marketing Manager Example:**
+        ```
+        Marketing Manager - Looking for a creative Marketing Manager with 5+ years experience 
+        in digital marketing, SEO, content creation, and social media management. 
+        Must have strong analytical skills.
+        ```
+        """
+
+TIPS_MARKDOWN = """
+    ---
+    **💡 Tips for best results:**
+    - Upload a complete, well-formatted resume
+    - Include the full job description with requirements and responsibilities
+    - The AI will automatically match your skills to job requirements
+    - Generated cover letters are formatted in markdown for easy editing
+    """
+
+ATTRIBUTION_HTML = """
+    <div style='text-align: center; color: #666; font-size: 0.9em; margin-top: 20px;'>
+    AI Cover Letter Generator | Built with ❤️ using Gradio & OpenAI
+    </div>
+    """
+
+
+def create_file_upload_section(file_count: str = "single") -> Tuple[gr.File, gr.Dropdown]:
     """
     Create the file upload section with resume upload and file type selection.
     
+    Args:
+        file_count: "single" for one resume, "multiple" to accept several
+    
     Returns:
         Tuple of (resume_file_input, file_type_dropdown)
     """
+    multiple = file_count == "multiple"
+    
     with gr.Column():
-        gr.Markdown("### 📄 Upload Resume")
+        gr.Markdown("### 📄 Upload Resumes" if multiple else "### 📄 Upload Resume")
         
         resume_file = gr.File(
-            label="Upload your resume",
+            label="Upload one or more resumes" if multiple else "Upload your resume",
             file_types=[".pdf", ".docx", ".doc", ".txt"],
-            file_count="single"
+            file_count=file_count
         )
         
         file_type = gr.Dropdown(
@@ -97,90 +164,85 @@ def create_output_section() -> Tuple[gr.Markdown, gr.Markdown]:
         return loading_status, cover_letter_output
 
 
-def create_examples_section() -> None:
-    """Create the examples section with sample job descriptions."""
-    with gr.Accordion("💡 Example Job Descriptions (click to copy)", open=False):
-        gr.Markdown("""
-        **Software Engineer Example:**
-        ```
-        Software Engineer - We are seeking a talented Software Engineer to join our team. 
-        Requirements: 3+ years Python experience, React, AWS, Docker. 
-        Responsibilities: Develop web applications, collaborate with team, maintain code quality.
-        ```
+def create_bulk_section() -> Tuple[gr.File, gr.Dropdown, gr.File, gr.Button, gr.Markdown]:
+    """
+    Create the bulk mode section for generating many cover letters at once.
+    
+    Returns:
+        Tuple of (resume_file, file_type, jobs_file, bulk_button, bulk_output)
+    """
+    gr.Markdown(BULK_INTRO_MARKDOWN)
+    
+    with gr.Row():
+        # Left column: Inputs
+        with gr.Column(scale=1):
+            resume_file, file_type = create_file_upload_section()
+            
+            gr.Markdown("### 📑 Job Descriptions")
+            jobs_file = gr.File(
+                label="Upload a CSV of job descriptions",
+                file_types=[".csv"],
+                file_count="single"
+            )
+            
+            bulk_button = gr.Button(
+                "📦 Generate All Cover Letters",
+                variant="primary",
+                size="lg"
+            )
         
-        **Marketing Manager Example:**
-        ```
-        Marketing Manager - Looking for a creative Marketing Manager with 5+ years experience 
-        in digital marketing, SEO, content creation, and social media management. 
-        Must have strong analytical skills.
-        ```
-        """)
-
-
-def create_footer() -> None:
-    """Create the application footer."""
-    gr.Markdown("""
-    ---
-    **💡 Tips for best results:**
-    - Upload a complete, well-formatted resume
-    - Include the full job description with requirements and responsibilities
-    - The AI will automatically match your skills to job requirements
-    - Generated cover letters are formatted in markdown for easy editing
-    """)
+        # Right column: Outputs
+        with gr.Column(scale=2):
+            gr.Markdown("### ✍️ Generated Cover Letters")
+            bulk_output = gr.Markdown(
+                value="Upload your resume and a CSV of job descriptions to get started.",
+                elem_classes=["cover-letter-output"]
+            )
     
-    # Footer with attribution
-    gr.Markdown("""
-    <div style='text-align: center; color: #666; font-size: 0.9em; margin-top: 20px;'>
-    AI Cover Letter Generator | Built with ❤️ using Gradio & OpenAI
-    </div>
-    """)
+    return resume_file, file_type, jobs_file, bulk_button, bulk_output
 
 
-def get_css_styles() -> str:
+def create_multi_resume_section() -> Tuple[gr.File, gr.Dropdown, gr.Textbox, gr.Button, gr.Markdown]:
     """
-    Get the CSS styles for the application.
+    Create the section for writing cover letters for several resumes at once.
     
     Returns:
-        CSS string for styling
-    """
-    return """
-    .gradio-container {
-        max-width: 1200px !important;
-        margin: auto !important;
-    }
-    .cover-letter-output {
-        font-family: 'Georgia', serif !important;
-        line-height: 1.6 !important;
-        word-wrap: break-word !important;
-        overflow-wrap: break-word !important;
-        white-space: pre-wrap !important;
-        max-width: 100% !important;
-        overflow-x: hidden !important;
-        word-break: break-word !important;
-        resize: vertical !important;
-    }
-    .cover-letter-output textarea {
-        word-wrap: break-word !important;
-        overflow-wrap: break-word !important;
-        word-break: break-word !important;
-        white-space: pre-wrap !important;
-        overflow-x: hidden !important;
-        max-width: 100% !important;
-        resize: vertical !important;
-    }
-    .loading-status {
-        background-color: #f8f9fa !important;
-        border: 2px solid #007bff !important;
-        border-radius: 10px !important;
-        margin: 10px 0 !important;
-        animation: pulse 2s infinite !important;
-    }
-    @keyframes pulse {
-        0% { opacity: 1; }
-        50% { opacity: 0.7; }
-        100% { opacity: 1; }
-    }
+        Tuple of (resume_files, file_type, job_description, generate_button, output)
     """
+    gr.Markdown(MULTI_RESUME_INTRO_MARKDOWN)
+    
+    with gr.Row():
+        # Left column: Inputs
+        with gr.Column(scale=1):
+            resume_files, file_type = create_file_upload_section(file_count="multiple")
+            job_description = create_job_description_section()
+            
+            generate_button = gr.Button(
+                "👥 Generate Cover Letters",
+                variant="primary",
+                size="lg"
+            )
+        
+        # Right column: Outputs
+        with gr.Column(scale=2):
+            gr.Markdown("### ✍️ Generated Cover Letters")
+            output = gr.Markdown(
+                value="Upload resumes and paste a job description to get started.",
+                elem_classes=["cover-letter-output"]
+            )
+    
+    return resume_files, file_type, job_description, generate_button, output
+
 
+def create_examples_section() -> None:
+    """Create the examples section with sample job descriptions."""
+    with gr.Accordion("💡 Example Job Descriptions (click to copy)", open=False):
+        gr.Markdown(EXAMPLES_MARKDOWN)
 
 
+def create_footer() -> None:
+    """Create the application footer."""
+    gr.Markdown(TIPS_MARKDOWN)
+    
+    # Footer with attribution
+    gr.Markdown(ATTRIBUTION_HTML)
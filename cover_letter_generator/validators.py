@@ -4,9 +4,27 @@ Input validation functions for the Cover Letter Generator.
 This module contains all validation logic, making it easy to test and reuse.
 """
 
+import os
 from typing import Optional, Tuple
 from data_types import ResumeFile, FileType
 
+# File extension to resume file type; anything else is treated as text
+_EXT_MAP = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".doc": "docx",
+    ".txt": "text",
+}
+
+# Result returned by every validator on success; shared rather than rebuilt per call
+_OK: Tuple[bool, Optional[str]] = (True, None)
+
+# Leading bytes of the binary resume formats (DOCX files are zip archives)
+_MAGIC_NUMBERS = (
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "docx"),
+)
+
 
 def validate_inputs(resume_file: Optional[ResumeFile], job_description: str) -> Tuple[bool, Optional[str]]:
     """
@@ -34,10 +52,35 @@ def validate_inputs(resume_file: Optional[ResumeFile], job_description: str) ->
     if resume_file is None:
         return False, "❌ Please upload a resume file."
     
-    if not job_description or not job_description.strip():
+    # isspace() checks in place instead of building a stripped copy
+    if not job_description or job_description.isspace():
         return False, "❌ Please provide a job description."
     
-    return True, None
+    return _OK
+
+
+def validate_batch_inputs(resume_file: Optional[ResumeFile], jobs_file: Optional[ResumeFile]) -> Tuple[bool, Optional[str]]:
+    """
+    Validate bulk-mode inputs before processing.
+    
+    Args:
+        resume_file: The uploaded resume file (can be None)
+        jobs_file: The uploaded CSV of job descriptions (can be None)
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    
+    Examples:
+        >>> validate_batch_inputs(file_object, None)
+        (False, "❌ Please upload a CSV file of job descriptions.")
+    """
+    if resume_file is None:
+        return False, "❌ Please upload a resume file."
+    
+    if jobs_file is None:
+        return False, "❌ Please upload a CSV file of job descriptions."
+    
+    return _OK
 
 
 def detect_file_type(file_path: str, user_specified_type: FileType = "auto") -> FileType:
@@ -64,14 +107,59 @@ def detect_file_type(file_path: str, user_specified_type: FileType = "auto") ->
     if user_specified_type != "auto":
         return user_specified_type
     
-    file_path_lower = file_path.lower()
+    # The file's contents are more reliable than its name
+    sniffed_type = sniff_file_type(file_path)
+    if sniffed_type is not None:
+        return sniffed_type
+    
+    extension = os.path.splitext(file_path)[1].lower()
+    return _EXT_MAP.get(extension, "text")
+
+
+def sniff_file_type(file_path: str) -> Optional[FileType]:
+    """
+    Detect a PDF or DOCX file from its first bytes.
+    
+    Args:
+        file_path: Path to the file to inspect
+    
+    Returns:
+        "pdf" or "docx", or None for any other (or unreadable) file
+    
+    Examples:
+        >>> sniff_file_type("resume.pdf")  # starts with b"%PDF-"
+        "pdf"
+    """
+    try:
+        with open(file_path, "rb") as file:
+            header = file.read(8)
+    except OSError:
+        return None
     
-    if file_path_lower.endswith('.pdf'):
-        return "pdf"
-    elif file_path_lower.endswith(('.docx', '.doc')):
-        return "docx"
-    else:
-        return "text"
+    for magic, file_type in _MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return file_type
+    return None
+
+
+def validate_file_contents(file_path: str, file_type: FileType) -> Tuple[bool, Optional[str]]:
+    """
+    Validate that a PDF or DOCX resume really is one.
+    
+    A corrupt or misnamed file is rejected here, before any time is spent
+    on the AI analysis.
+    
+    Args:
+        file_path: Path to the file to validate
+        file_type: The file type the resume will be read as
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if file_type in ("pdf", "docx") and sniff_file_type(file_path) != file_type:
+        return False, f"❌ The file is not a valid {file_type.upper()} document."
+    
+    return _OK
 
 
 def validate_file_size(file_path: str, max_size_mb: int = 2) -> Tuple[bool, Optional[str]]:
@@ -85,8 +173,6 @@ def validate_file_size(file_path: str, max_size_mb: int = 2) -> Tuple[bool, Opti
     Returns:
         Tuple of (is_valid, error_message)
     """
-    import os
-    
     try:
         file_size_bytes = os.path.getsize(file_path)
         file_size_mb = file_size_bytes / (1024 * 1024)
@@ -94,6 +180,6 @@ def validate_file_size(file_path: str, max_size_mb: int = 2) -> Tuple[bool, Opti
         if file_size_mb > max_size_mb:
             return False, f"❌ File too large ({file_size_mb:.1f}MB). Maximum size: {max_size_mb}MB"
         
-        return True, None
+        return _OK
     except OSError:
         return False, "❌ Could not read file size"
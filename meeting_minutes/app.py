@@ -15,14 +15,16 @@ Features:
 
 import gradio as gr
 import os
+import socket
 import tempfile
-from typing import Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 from datetime import datetime
 
-# Import our modules
-from audio_processor import AudioProcessor
-from meeting_analyzer import MeetingAnalyzer
-from config import OPENAI_API_KEY, MAX_FILE_SIZE_MB
+# Import our modules (the processing modules are imported by MeetingMinutesGenerator)
+from config import OPENAI_API_KEY, MAX_DURATION_SEC, ERROR_MESSAGES, SUCCESS_MESSAGES
+
+# Stylesheet served from a file instead of an inline Python string
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
 
 
 class MeetingMinutesGenerator:
@@ -30,64 +32,77 @@ class MeetingMinutesGenerator:
     
     def __init__(self):
         """Initialize the meeting minutes generator."""
+        # Imported here so importing the app doesn't load the processing modules
+        from audio_processor import AudioProcessor
+        from meeting_analyzer import MeetingAnalyzer
+        
         self.audio_processor = AudioProcessor()
         self.meeting_analyzer = MeetingAnalyzer()
     
-    def process_meeting(self, audio_file, meeting_title: str = "", participants: str = "") -> Tuple[str, str]:
+    def process_meeting(self, audio_file, meeting_title: str = "", participants: str = "") -> Iterator[Tuple[str, str]]:
         """
         Process an MP3 meeting recording and generate minutes.
         
+        Yields the outputs after every step, so the interface shows what is
+        happening and each result as soon as it is ready instead of staying
+        blank until everything has finished.
+        
         Args:
             audio_file: Uploaded MP3 file
             meeting_title: Optional meeting title
             participants: Optional list of participants
             
-        Returns:
-            Tuple of (summary, action_items)
+        Yields:
+            Tuples of (summary, action_items); the last one is the final result
         """
         if audio_file is None:
-            return "❌ Please upload an MP3 file.", ""
+            yield "❌ Please upload an MP3 file.", ""
+            return
         
         try:
             # Step 1: Validate file
-            if not self._validate_audio_file(audio_file):
-                return "❌ Invalid file format. Please upload an MP3 file.", ""
+            error = self._validate_audio_file(audio_file)
+            if error:
+                yield error, ""
+                return
             
             # Step 2: Transcribe audio
+            yield SUCCESS_MESSAGES["transcribing"], ""
             transcription = self.audio_processor.transcribe_audio(audio_file)
             if not transcription:
-                return "❌ Failed to transcribe audio. Please check your file.", ""
+                yield "❌ Failed to transcribe audio. Please check your file.", ""
+                return
             
             # Step 3: Analyze meeting
-            summary, action_items = self.meeting_analyzer.analyze_meeting(
+            yield SUCCESS_MESSAGES["analyzing"], ""
+            yield from self.meeting_analyzer.iter_analysis(
                 transcription, 
                 meeting_title, 
                 participants
             )
             
-            return summary, action_items
-            
         except Exception as e:
-            return f"❌ Error processing meeting: {str(e)}", ""
+            yield f"❌ Error processing meeting: {str(e)}", ""
     
-    def _validate_audio_file(self, audio_file) -> bool:
-        """Validate the uploaded audio file."""
-        if not audio_file:
-            return False
+    def _validate_audio_file(self, audio_file: str) -> Optional[str]:
+        """
+        Validate the uploaded audio file (a file path, as uploaded by gr.File).
         
-        # Check file extension
-        if not audio_file.name.lower().endswith('.mp3'):
-            return False
+        Returns:
+            The error message to show the user, or None if the file is valid
+        """
+        if not audio_file:
+            return ERROR_MESSAGES["no_file"]
         
-        # Check file size
-        try:
-            file_size_mb = os.path.getsize(audio_file.name) / (1024 * 1024)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                return False
-        except:
-            return False
+        # Check extension, size and MP3 signature before anything is uploaded
+        if not self.audio_processor.validate_audio_file(audio_file):
+            return ERROR_MESSAGES["invalid_format"]
         
-        return True
+        # Check the length from the MP3 headers, without decoding the audio
+        duration = self.audio_processor.get_audio_duration(audio_file)
+        if duration is not None and duration > MAX_DURATION_SEC:
+            return ERROR_MESSAGES["too_long"]
+        return None
 
 
 def create_interface() -> gr.Blocks:
@@ -98,26 +113,7 @@ def create_interface() -> gr.Blocks:
     with gr.Blocks(
         title="Meeting Minutes Generator",
         theme=gr.themes.Soft(),
-        css="""
-        .gradio-container {
-            max-width: 1200px !important;
-            margin: auto !important;
-        }
-        .meeting-output {
-            font-family: 'Georgia', serif;
-            line-height: 1.6;
-            word-wrap: break-word !important;
-            overflow-wrap: break-word !important;
-            white-space: pre-wrap !important;
-            max-width: 100% !important;
-        }
-        .action-items {
-            background-color: #f8f9fa;
-            border-left: 4px solid #007bff;
-            padding: 15px;
-            margin: 10px 0;
-        }
-        """
+        css_paths=[CSS_PATH]
     ) as interface:
         
         gr.Markdown("""
@@ -237,6 +233,26 @@ def create_interface() -> gr.Blocks:
     return interface
 
 
+def _find_free_port(candidates: List[int]) -> Optional[int]:
+    """
+    Return the first port from candidates that can be bound, or None.
+    
+    Args:
+        candidates: Ports to try, in order of preference
+    
+    Returns:
+        A free port number, or None if every candidate is taken
+    """
+    for port in candidates:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("0.0.0.0", port))
+                return port
+            except OSError:
+                continue
+    return None
+
+
 def main():
     """Main function to run the application."""
     print("🚀 Starting Meeting Minutes Generator...")
@@ -244,33 +260,31 @@ def main():
     
     interface = create_interface()
     
-    # Try different ports if 7860 is occupied
+    # Pick the first free port up front; a failed launch() only fails after
+    # the whole server has started up, so probing with a socket is much cheaper
     ports_to_try = [7860, 7861, 7862, 7863, 7864]
+    port = _find_free_port(ports_to_try)
+    if port is None:
+        print(f"❌ Failed to launch: no free port in {ports_to_try}")
+        return
     
-    for port in ports_to_try:
-        try:
-            print(f"🚀 Trying to launch on port {port}...")
-            print(f"✅ Successfully launched on port {port}!")
-            print(f"🌐 Local access: http://127.0.0.1:{port}")
-            print(f"🌍 Public URL will be generated by Gradio...")
-            
-            interface.launch(
-                server_name="0.0.0.0",
-                server_port=port,
-                share=True,
-                show_error=True,
-                quiet=False,
-                inbrowser=True
-            )
-            break
-            
-        except OSError as e:
-            if "Cannot find empty port" in str(e) and port < ports_to_try[-1]:
-                print(f"❌ Port {port} is busy, trying next port...")
-                continue
-            else:
-                print(f"❌ Failed to launch: {e}")
-                break
+    print(f"🚀 Launching on port {port}...")
+    print(f"🌐 Local access: http://127.0.0.1:{port}")
+    
+    # A public share link needs a round trip to Gradio's tunnel service before
+    # the app is usable, so it is only created when asked for with GRADIO_SHARE=1
+    share = os.getenv("GRADIO_SHARE") == "1"
+    if share:
+        print(f"🌍 Public URL will be generated by Gradio...")
+    
+    interface.launch(
+        server_name="0.0.0.0",
+        server_port=port,
+        share=share,
+        show_error=True,
+        quiet=False,
+        inbrowser=True
+    )
 
 
 if __name__ == "__main__":
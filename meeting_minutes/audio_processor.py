@@ -4,54 +4,224 @@ Audio Processing Module for Meeting Minutes Generator
 This module handles MP3 audio file processing and transcription using OpenAI's Whisper API.
 """
 
+import glob
 import os
+import shutil
+import subprocess
 import tempfile
-from typing import Optional
-from openai import OpenAI
-from config import OPENAI_API_KEY
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+from config import (
+    get_openai_client, openai_retry, MAX_FILE_SIZE_MB, WHISPER_MAX_FILE_MB, WHISPER_MODEL, TRANSCRIPTION_LANGUAGE,
+    CHUNK_THRESHOLD_MB, TRANSCRIPTION_CHUNK_SECONDS, MAX_TRANSCRIPTION_WORKERS
+)
+from result_cache import ResultCache, hash_file
+
+try:
+    from mutagen.mp3 import MP3
+except ImportError:  # Optional; without it durations are estimated from the file size
+    MP3 = None
+
+# ffmpeg binary used to split long recordings, looked up once; None when it isn't installed
+FFMPEG = shutil.which("ffmpeg")
+
+# Read buffer for uploads: page-sized on Linux/macOS, 8KB on Windows
+UPLOAD_BUFFER_SIZE = 8192 if os.name == "nt" else 4096
+
+# Files up to this size are read into memory once before uploading
+IN_MEMORY_UPLOAD_BYTES = 16 * 1024 * 1024
+
+# MP3 files start with an ID3 tag or straight away with an MPEG frame header
+ID3_MAGIC = b"ID3"
+MPEG_FRAME_SYNC = 0xE0  # The 11 frame-sync bits are all set: 0xFF then the top 3 bits of the next byte
+
+
+def _stat_file(file_path: str) -> Optional[os.stat_result]:
+    """Stat a file once, returning None if it doesn't exist or can't be read."""
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+
+def has_mp3_signature(file_path: str) -> bool:
+    """
+    Check the first bytes of a file for an ID3 tag or an MPEG frame sync.
+    
+    Only the first 10 bytes are read, so mislabeled files are rejected
+    before being uploaded to Whisper.
+    
+    Args:
+        file_path: Path to the file to check
+        
+    Returns:
+        True if the file starts like an MP3 file
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        header = os.read(fd, 10)
+    finally:
+        os.close(fd)
+    
+    if header.startswith(ID3_MAGIC):
+        return True
+    return len(header) >= 2 and header[0] == 0xFF and header[1] & MPEG_FRAME_SYNC == MPEG_FRAME_SYNC
 
 
 class AudioProcessor:
     """Handles audio file processing and transcription."""
     
     def __init__(self):
-        """Initialize the audio processor with OpenAI client."""
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        """Initialize the audio processor with the shared OpenAI client."""
+        self.client = get_openai_client()
+        self.cache = ResultCache()
     
-    def transcribe_audio(self, audio_file_path: str) -> Optional[str]:
+    def transcribe_audio(self, audio_file_path: str, language: str = TRANSCRIPTION_LANGUAGE) -> Optional[str]:
         """
         Transcribe an MP3 audio file to text using OpenAI Whisper.
         
+        Long recordings are split into chunks that are transcribed in
+        parallel, so a two-hour meeting isn't one long serial request.
+        Transcriptions are cached by a hash of the file contents, so the same
+        recording is only sent to Whisper once.
+        
         Args:
             audio_file_path: Path to the MP3 audio file
+            language: Language spoken in the recording (ISO-639-1), or "" to let Whisper detect it
             
         Returns:
             Transcribed text or None if failed
         """
         try:
             # Validate file exists
-            if not os.path.exists(audio_file_path):
+            stat = _stat_file(audio_file_path)
+            if stat is None:
                 raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
             
-            # Open the audio file
-            with open(audio_file_path, "rb") as audio_file:
-                # Transcribe using OpenAI Whisper
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-                
+            # Reuse the transcription of an identical recording
+            cache_key = f"transcription:{WHISPER_MODEL}:{language}:{hash_file(audio_file_path)}"
+            transcript = self.cache.get(cache_key)
+            if transcript is not None:
                 return transcript
+            
+            # Split long recordings when ffmpeg is available
+            if FFMPEG and stat.st_size > CHUNK_THRESHOLD_MB * 1024 * 1024:
+                transcript = self._transcribe_in_chunks(audio_file_path, language)
+            
+            if transcript is None:
+                # Whisper rejects files over its size limit, so don't upload them whole
+                if stat.st_size > WHISPER_MAX_FILE_MB * 1024 * 1024:
+                    raise ValueError(
+                        f"File too large to transcribe in one request (maximum {WHISPER_MAX_FILE_MB}MB) "
+                        "and it could not be split into chunks"
+                    )
+                transcript = self._transcribe_file(audio_file_path, language, stat.st_size)
+            
+            self.cache.set(cache_key, transcript)
+            return transcript
                 
         except Exception as e:
             print(f"Error transcribing audio: {str(e)}")
             return None
     
+    def _transcribe_file(self, audio_file_path: str, language: str, file_size: Optional[int] = None) -> str:
+        """
+        Transcribe a single audio file with one Whisper request.
+        
+        Small files are read in one go and uploaded from memory, so building
+        the multipart request doesn't go back to the disk in small reads.
+        Larger files are streamed through a fixed-size read buffer.
+        The file is only stat'ed if the caller doesn't pass its size.
+        """
+        if file_size is None:
+            file_size = os.path.getsize(audio_file_path)
+        
+        if file_size <= IN_MEMORY_UPLOAD_BYTES:
+            with open(audio_file_path, "rb") as audio_file:
+                data = audio_file.read()
+            return self._create_transcription((os.path.basename(audio_file_path), data, "audio/mpeg"), language)
+        
+        with open(audio_file_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as audio_file:
+            return self._create_transcription(audio_file, language)
+    
+    @openai_retry
+    def _create_transcription(self, audio_file, language: str) -> str:
+        """
+        Send audio (a file object or a (name, bytes, content type) tuple) to Whisper.
+        
+        A known language lets Whisper skip detecting it, and temperature 0
+        makes the output deterministic, so cached transcriptions stay valid.
+        """
+        options = {"language": language} if language else {}
+        
+        # Transcribe using OpenAI Whisper
+        return self.client.audio.transcriptions.create(
+            model=WHISPER_MODEL,
+            file=audio_file,
+            response_format="text",
+            temperature=0,
+            **options
+        )
+    
+    def _transcribe_in_chunks(self, audio_file_path: str, language: str) -> Optional[str]:
+        """
+        Transcribe a long recording as chunks sent to Whisper in parallel.
+        
+        Args:
+            audio_file_path: Path to the MP3 audio file
+            language: Language spoken in the recording, or "" to let Whisper detect it
+            
+        Returns:
+            The chunk transcripts joined in order, or None if the file couldn't be split
+        """
+        # In the platform's temporary directory, so chunking works on Windows too
+        with tempfile.TemporaryDirectory() as chunk_dir:
+            chunk_paths = self._split_audio(audio_file_path, chunk_dir)
+            if not chunk_paths:
+                return None
+            
+            workers = min(MAX_TRANSCRIPTION_WORKERS, len(chunk_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map() returns the transcripts in chunk order
+                transcripts = list(executor.map(partial(self._transcribe_file, language=language), chunk_paths))
+        
+        return " ".join(transcript.strip() for transcript in transcripts)
+    
+    def _split_audio(self, audio_file_path: str, chunk_dir: str) -> List[str]:
+        """
+        Split an MP3 file into TRANSCRIPTION_CHUNK_SECONDS long chunks with ffmpeg.
+        
+        The audio is copied rather than re-encoded, so splitting only reads
+        the file once and cuts fall on MP3 frame boundaries.
+        
+        Returns:
+            Chunk file paths in playback order (empty if splitting failed)
+        """
+        result = subprocess.run(
+            [
+                FFMPEG, "-nostdin", "-loglevel", "error",
+                "-i", audio_file_path,
+                "-f", "segment", "-segment_time", str(TRANSCRIPTION_CHUNK_SECONDS),
+                "-c", "copy",
+                os.path.join(chunk_dir, "chunk_%04d.mp3")
+            ],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            print(f"Could not split audio, transcribing it whole: {result.stderr.strip()}")
+            return []
+        
+        return sorted(glob.glob(os.path.join(chunk_dir, "chunk_*.mp3")))
+    
     def validate_audio_file(self, file_path: str) -> bool:
         """
         Validate that the uploaded file is a valid MP3 audio file.
         
+        The file is stat'ed once for its existence and size, and only its
+        first bytes are read to check the MP3 signature.
+        
         Args:
             file_path: Path to the file to validate
             
@@ -64,15 +234,21 @@ class AudioProcessor:
                 return False
             
             # Check file exists
-            if not os.path.exists(file_path):
+            stat = _stat_file(file_path)
+            if stat is None:
+                return False
+            
+            # Check file size
+            file_size_mb = stat.st_size / (1024 * 1024)
+            if stat.st_size == 0 or file_size_mb > MAX_FILE_SIZE_MB:
                 return False
             
-            # Check file size (basic validation)
-            file_size = os.path.getsize(file_path)
-            if file_size == 0:
+            # Whisper rejects large files unless they can be sent as chunks
+            if file_size_mb > WHISPER_MAX_FILE_MB and FFMPEG is None:
                 return False
             
-            return True
+            # Check the contents really are MP3 audio
+            return has_mp3_signature(file_path)
             
         except Exception:
             return False
@@ -81,6 +257,10 @@ class AudioProcessor:
         """
         Get the duration of an audio file in seconds.
         
+        With mutagen installed the duration is read from the MP3 headers,
+        which only touches the first few KB of the file and is exact for
+        VBR recordings too. Otherwise it is estimated from the file size.
+        
         Args:
             file_path: Path to the audio file
             
@@ -88,10 +268,14 @@ class AudioProcessor:
             Duration in seconds or None if failed
         """
         try:
-            # This is a placeholder - in a real implementation, you might use
-            # libraries like pydub or librosa to get accurate duration
-            # For now, we'll estimate based on file size (rough approximation)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            if MP3 is not None:
+                return MP3(file_path).info.length
+            
+            # Without mutagen, estimate based on file size (rough approximation)
+            stat = _stat_file(file_path)
+            if stat is None:
+                return None
+            file_size_mb = stat.st_size / (1024 * 1024)
             
             # Rough estimate: 1MB ≈ 1 minute of MP3 audio
             estimated_duration = file_size_mb * 60
@@ -5,8 +5,12 @@ This module contains all configuration settings, API keys, and constants.
 """
 
 import os
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 # Load environment variables
 load_dotenv(override=True)
 
@@ -19,11 +23,61 @@ if not OPENAI_API_KEY:
         "OPENAI_API_KEY=your_api_key_here"
     )
 
+# Created by get_openai_client on first use
+_shared_client: Optional["OpenAI"] = None
+
+
+def get_openai_client() -> "OpenAI":
+    """
+    Return the shared OpenAI client, creating it on first use.
+    
+    Transcription and meeting analysis both use this client, so their
+    requests (including the parallel ones) reuse HTTP/2 connections from
+    one pool instead of each paying for its own TCP/TLS handshake.
+    """
+    global _shared_client
+    if _shared_client is None:
+        import httpx
+        from openai import OpenAI
+        
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        _shared_client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    return _shared_client
+
+
+def openai_retry(func):
+    """
+    Decorate an OpenAI request so transient failures are retried.
+    
+    Rate limits, connection errors (including timeouts) and server errors
+    are retried with randomized exponential backoff, so one failed call
+    doesn't throw away the transcription or analysis done before it.
+    Other errors, and the last failure, are raised as usual.
+    """
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+    
+    return retry(
+        retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )(func)
+
+
 # Application Settings
 MAX_FILE_SIZE_MB = 50  # Maximum MP3 file size in MB
+MAX_DURATION_SEC = 3 * 60 * 60  # Maximum recording length (3 hours)
+WHISPER_MAX_FILE_MB = 25  # Largest file Whisper accepts in one request; larger files must be split
 SUPPORTED_FORMATS = [".mp3"]
 DEFAULT_MODEL = "gpt-4o-mini"
 WHISPER_MODEL = "whisper-1"
+# Language of the recordings (ISO-639-1), so Whisper skips language detection;
+# set TRANSCRIPTION_LANGUAGE to an empty string to let it detect the language
+TRANSCRIPTION_LANGUAGE = os.getenv("TRANSCRIPTION_LANGUAGE", "en")
 
 # UI Settings
 MAX_SUMMARY_LENGTH = 2000
@@ -32,13 +86,30 @@ DEFAULT_TEMPERATURE = 0.3
 
 # File Processing Settings
 TEMP_DIR = "/tmp"  # Directory for temporary files
-MAX_TRANSCRIPTION_LENGTH = 100000  # Maximum characters in transcription
+MAX_TRANSCRIPTION_LENGTH = 100000  # Maximum characters in transcription (when tiktoken isn't installed)
+MAX_TRANSCRIPTION_TOKENS = 115000  # Maximum tokens in transcription, leaving room for the prompt and response
+
+# Transcription Settings
+# Recordings larger than this are split into chunks that are transcribed in
+# parallel (needs ffmpeg); smaller ones are sent to Whisper in one request
+CHUNK_THRESHOLD_MB = 10
+TRANSCRIPTION_CHUNK_SECONDS = 600  # Length of each chunk (10 minutes)
+MAX_TRANSCRIPTION_WORKERS = 5  # Chunks transcribed at the same time
+
+# Cache Settings
+# Transcriptions and analyses are cached by a hash of their inputs; on disk
+# when diskcache is installed, otherwise in memory. diskcache stores pickles,
+# so the directory is private to the user rather than in the shared /tmp
+CACHE_DIR = os.path.expanduser("~/.cache/meeting_minutes")
+CACHE_EXPIRE_SEC = 7 * 24 * 60 * 60  # Cached transcripts and analyses are kept for a week
+MEMORY_CACHE_SIZE = 128  # Results kept when caching in memory
 
 # Error Messages
 ERROR_MESSAGES = {
     "no_file": "❌ Please upload an MP3 file.",
     "invalid_format": "❌ Invalid file format. Please upload an MP3 file.",
     "file_too_large": f"❌ File too large. Maximum size: {MAX_FILE_SIZE_MB}MB",
+    "too_long": f"❌ Recording too long (max {MAX_DURATION_SEC // 60} minutes).",
     "transcription_failed": "❌ Failed to transcribe audio. Please check your file.",
     "analysis_failed": "❌ Failed to analyze meeting. Please try again.",
     "api_error": "❌ API error. Please check your OpenAI API key."
@@ -49,6 +120,7 @@ SUCCESS_MESSAGES = {
     "processing": "🔄 Processing audio file...",
     "transcribing": "🎙️ Transcribing audio...",
     "analyzing": "🧠 Analyzing meeting content...",
+    "extracting": "⏳ Extracting action items...",
     "generating": "📝 Generating meeting minutes...",
     "complete": "✅ Meeting minutes generated successfully!"
 }
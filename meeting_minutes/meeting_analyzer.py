@@ -5,17 +5,128 @@ This module handles AI-powered analysis of meeting transcriptions to generate
 comprehensive summaries and extract action items.
 """
 
-from typing import Tuple, Optional
-from openai import OpenAI
-from config import OPENAI_API_KEY
+import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterator, List, Tuple, Optional
+from config import (
+    get_openai_client, openai_retry, DEFAULT_MODEL, MAX_TRANSCRIPTION_LENGTH, MAX_TRANSCRIPTION_TOKENS, SUCCESS_MESSAGES
+)
+from result_cache import ResultCache, hash_text
+
+# Asks for the summary and the action items in one JSON response, so the
+# transcription is only sent (and paid for) once
+COMBINED_SYSTEM_PROMPT = """You are an expert meeting analyst. Analyze the meeting transcription and return a JSON object with two fields, each a markdown string:
+
+        "summary": a comprehensive, professional meeting summary that includes:
+        1. Meeting Overview
+        2. Key Discussion Points
+        3. Decisions Made
+        4. Important Information Shared
+        5. Next Steps Overview
+        Format it in a clear, professional manner suitable for meeting minutes, with bullet points
+        and clear headings. Focus on actionable information and key outcomes.
+
+        "action_items": the action items from the discussion, identifying:
+        1. Specific tasks assigned to individuals
+        2. Deadlines and due dates mentioned
+        3. Follow-up actions required
+        4. Decisions that need implementation
+        5. Next meeting or check-in dates
+        For each, give who is responsible (if mentioned), what needs to be done, when it's due
+        (if mentioned) and its priority level (if apparent). If no clear action items are found,
+        indicate that no specific action items were identified.
+        """
+
+# How long iter_analysis waits for more streamed summary text before checking
+# whether the summary request has finished
+STREAM_POLL_SECONDS = 0.1
+
+# System prompts for the separate summary and action item requests. Defined
+# once so every request starts with the same prefix, which is what OpenAI's
+# automatic prompt caching keys on
+SUMMARY_SYSTEM_PROMPT = """You are an expert meeting analyst. Create a comprehensive, professional meeting summary that includes:
+
+        1. Meeting Overview
+        2. Key Discussion Points
+        3. Decisions Made
+        4. Important Information Shared
+        5. Next Steps Overview
+
+        Format the summary in a clear, professional manner suitable for meeting minutes.
+        Use bullet points and clear headings for easy reading.
+        Focus on actionable information and key outcomes.
+        """
+
+ACTION_ITEMS_SYSTEM_PROMPT = """You are an expert at extracting action items from meeting discussions. Analyze the transcription and identify:
+
+        1. Specific tasks assigned to individuals
+        2. Deadlines and due dates mentioned
+        3. Follow-up actions required
+        4. Decisions that need implementation
+        5. Next meeting or check-in dates
+
+        Format the action items clearly with:
+        - Who is responsible (if mentioned)
+        - What needs to be done
+        - When it's due (if mentioned)
+        - Priority level (if apparent)
+
+        If no clear action items are found, indicate that no specific action items were identified.
+        """
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Return the tiktoken encoding for the analysis model, or None when tiktoken isn't installed."""
+    try:
+        import tiktoken  # Optional; imported on first use since loading an encoding is slow
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(DEFAULT_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # e.g. the encoding file can't be downloaded
+        print(f"Could not load the tiktoken encoding, truncating by characters: {str(e)}")
+        return None
+
+
+def truncate_transcription(transcription: str) -> str:
+    """
+    Truncate a transcription to what fits in the model's context window.
+    
+    Counts real tokens with tiktoken when it is installed, so the limit
+    can sit close to the context window without overflowing it; otherwise
+    falls back to MAX_TRANSCRIPTION_LENGTH characters.
+    
+    Args:
+        transcription: The meeting transcription
+        
+    Returns:
+        The transcription, with "..." appended if it was truncated
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        if len(transcription) > MAX_TRANSCRIPTION_LENGTH:
+            return transcription[:MAX_TRANSCRIPTION_LENGTH] + "..."
+        return transcription
+    
+    tokens = encoding.encode(transcription, disallowed_special=())
+    if len(tokens) > MAX_TRANSCRIPTION_TOKENS:
+        return encoding.decode(tokens[:MAX_TRANSCRIPTION_TOKENS]) + "..."
+    return transcription
 
 
 class MeetingAnalyzer:
     """Handles AI-powered meeting analysis and summarization."""
     
     def __init__(self):
-        """Initialize the meeting analyzer with OpenAI client."""
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        """Initialize the meeting analyzer with the shared OpenAI client."""
+        self.client = get_openai_client()
+        self.cache = ResultCache()
     
     def analyze_meeting(self, transcription: str, meeting_title: str = "", participants: str = "") -> Tuple[str, str]:
         """
@@ -29,27 +140,145 @@ class MeetingAnalyzer:
         Returns:
             Tuple of (summary, action_items)
         """
+        result = ("", "")
+        for result in self.iter_analysis(transcription, meeting_title, participants):
+            pass
+        return result
+    
+    def iter_analysis(self, transcription: str, meeting_title: str = "", participants: str = "") -> Iterator[Tuple[str, str]]:
+        """
+        Analyze a meeting transcription, yielding (summary, action_items) as they become ready.
+        
+        Both are requested in a single JSON response. If that response can't
+        be used, they are requested separately instead; those two requests
+        are independent, so they are sent at the same time; the summary is
+        streamed and yielded as it arrives, with a placeholder for the action
+        items until they are ready. The last tuple yielded is always the
+        complete result.
+        
+        Results of the single request are cached by a hash of the inputs, so
+        analyzing the same meeting again returns straight away.
+        
+        Args:
+            transcription: The transcribed meeting text
+            meeting_title: Optional meeting title for context
+            participants: Optional list of participants
+            
+        Yields:
+            Tuples of (summary, action_items)
+        """
         try:
-            # Generate meeting summary
-            summary = self._generate_summary(transcription, meeting_title, participants)
+            # Reuse the analysis of an identical meeting
+            cache_key = f"analysis:{DEFAULT_MODEL}:{hash_text(transcription, meeting_title, participants)}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield tuple(cached)
+                return
             
-            # Extract action items
-            action_items = self._extract_action_items(transcription, participants)
+            # Keep very long meetings inside the model's context window
+            transcription = truncate_transcription(transcription)
             
-            return summary, action_items
+            combined = self._analyze_combined(transcription, meeting_title, participants)
+            if combined is not None:
+                self.cache.set(cache_key, combined)
+                yield combined
+                return
+            
+            # The fallback requests report failures as text, so their results aren't cached
+            summary_updates: "queue.Queue[str]" = queue.Queue()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Generate meeting summary, streaming its text into summary_updates
+                summary_future = executor.submit(
+                    self._generate_summary, transcription, meeting_title, participants, summary_updates.put
+                )
+                
+                # Extract action items
+                action_items_future = executor.submit(self._extract_action_items, transcription, participants)
+                
+                # Show the summary as it is written, and the action items once they are ready
+                summary_parts: List[str] = []
+                while not summary_future.done():
+                    try:
+                        summary_parts.append(summary_updates.get(timeout=STREAM_POLL_SECONDS))
+                    except queue.Empty:
+                        continue
+                    
+                    # Take everything else that has arrived, so the interface updates once per batch
+                    while not summary_updates.empty():
+                        summary_parts.append(summary_updates.get_nowait())
+                    
+                    action_items = action_items_future.result() if action_items_future.done() else SUCCESS_MESSAGES["extracting"]
+                    yield "".join(summary_parts), action_items
+                
+                if not action_items_future.done():
+                    yield summary_future.result(), SUCCESS_MESSAGES["extracting"]
+                
+                yield summary_future.result(), action_items_future.result()
             
         except Exception as e:
             error_msg = f"Error analyzing meeting: {str(e)}"
-            return error_msg, ""
+            yield error_msg, ""
+    
+    @openai_retry
+    def _create_completion(self, **kwargs):
+        """Send a chat completion request, retrying transient failures."""
+        return self.client.chat.completions.create(**kwargs)
+    
+    def _analyze_combined(self, transcription: str, meeting_title: str, participants: str) -> Optional[Tuple[str, str]]:
+        """
+        Generate the meeting summary and the action items with one request.
+        
+        Args:
+            transcription: The meeting transcription
+            meeting_title: Optional meeting title
+            participants: Optional participants list
+            
+        Returns:
+            Tuple of (summary, action_items), or None if the response isn't usable
+        """
+        context = f"""
+        Meeting Title: {meeting_title if meeting_title else "Not specified"}
+        Participants: {participants if participants else "Not specified"}
+        
+        Meeting Transcription:
+        {transcription}
+        """
+        
+        response = self._create_completion(
+            model=DEFAULT_MODEL,
+            messages=[
+                {"role": "system", "content": COMBINED_SYSTEM_PROMPT},
+                {"role": "user", "content": context}
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=3500,
+            temperature=0.3
+        )
+        
+        try:
+            result = json.loads(response.choices[0].message.content)
+            summary, action_items = result["summary"], result["action_items"]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"Combined analysis response was not usable, falling back: {str(e)}")
+            return None
+        
+        if not isinstance(summary, str) or not isinstance(action_items, str):
+            return None
+        return summary, action_items
     
-    def _generate_summary(self, transcription: str, meeting_title: str, participants: str) -> str:
+    def _generate_summary(self, transcription: str, meeting_title: str, participants: str,
+                          on_text: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate a comprehensive meeting summary.
         
+        The summary is streamed, so on_text can show it while it is still
+        being written rather than after the whole response has been generated.
+        
         Args:
             transcription: The meeting transcription
             meeting_title: Optional meeting title
             participants: Optional participants list
+            on_text: Optional callback receiving each piece of text as it arrives
             
         Returns:
             Formatted meeting summary
@@ -63,31 +292,28 @@ class MeetingAnalyzer:
         {transcription}
         """
         
-        system_prompt = """You are an expert meeting analyst. Create a comprehensive, professional meeting summary that includes:
-
-        1. Meeting Overview
-        2. Key Discussion Points
-        3. Decisions Made
-        4. Important Information Shared
-        5. Next Steps Overview
-
-        Format the summary in a clear, professional manner suitable for meeting minutes.
-        Use bullet points and clear headings for easy reading.
-        Focus on actionable information and key outcomes.
-        """
-        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = self._create_completion(
+                model=DEFAULT_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
                     {"role": "user", "content": context}
                 ],
                 max_tokens=2000,
-                temperature=0.3
+                temperature=0.3,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            parts = []
+            for chunk in response:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if not content:
+                    continue
+                parts.append(content)
+                if on_text:
+                    on_text(content)
+            
+            return "".join(parts)
             
         except Exception as e:
             return f"Error generating summary: {str(e)}"
@@ -110,28 +336,11 @@ class MeetingAnalyzer:
         {transcription}
         """
         
-        system_prompt = """You are an expert at extracting action items from meeting discussions. Analyze the transcription and identify:
-
-        1. Specific tasks assigned to individuals
-        2. Deadlines and due dates mentioned
-        3. Follow-up actions required
-        4. Decisions that need implementation
-        5. Next meeting or check-in dates
-
-        Format the action items clearly with:
-        - Who is responsible (if mentioned)
-        - What needs to be done
-        - When it's due (if mentioned)
-        - Priority level (if apparent)
-
-        If no clear action items are found, indicate that no specific action items were identified.
-        """
-        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = self._create_completion(
+                model=DEFAULT_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": ACTION_ITEMS_SYSTEM_PROMPT},
                     {"role": "user", "content": context}
                 ],
                 max_tokens=1500,
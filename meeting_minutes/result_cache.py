@@ -0,0 +1,95 @@
+"""
+Result Cache Module for Meeting Minutes Generator
+
+This module stores transcriptions and meeting analyses keyed by a hash of
+their inputs, so processing the same recording again doesn't repeat the
+Whisper and GPT requests.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Optional
+from config import CACHE_DIR, CACHE_EXPIRE_SEC, MEMORY_CACHE_SIZE
+
+try:
+    import diskcache
+except ImportError:  # Optional; without it results are only cached in memory
+    diskcache = None
+
+# Files are hashed in blocks of this size so large recordings aren't read into memory at once
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Hash a file's contents with BLAKE2b.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(*parts: str) -> str:
+    """
+    Hash one or more strings with BLAKE2b.
+    
+    The parts are separated so ("ab", "c") and ("a", "bc") hash differently.
+    
+    Returns:
+        Hex digest of the parts
+    """
+    digest = hashlib.blake2b()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Stores results by key, on disk when diskcache is installed.
+    
+    On disk the results survive restarts (for CACHE_EXPIRE_SEC) and are
+    shared by every instance; otherwise the most recently used
+    MEMORY_CACHE_SIZE results are kept in memory.
+    """
+    
+    def __init__(self):
+        """Open the disk cache, or set up the in-memory one."""
+        self._disk_cache = None
+        if diskcache is not None:
+            # Only the current user may read or write the cached pickles
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            os.chmod(CACHE_DIR, 0o700)
+            self._disk_cache = diskcache.Cache(CACHE_DIR)
+        self._memory_cache: "OrderedDict[str, Any]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the result stored under key, or None if there isn't one."""
+        if self._disk_cache is not None:
+            return self._disk_cache.get(key)
+        
+        if key not in self._memory_cache:
+            return None
+        self._memory_cache.move_to_end(key)
+        return self._memory_cache[key]
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a result under key."""
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, value, expire=CACHE_EXPIRE_SEC)
+            return
+        
+        self._memory_cache[key] = value
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
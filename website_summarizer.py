@@ -1,6 +1,10 @@
 # Complete Website Summarizer using OpenAI GPT-4o-mini
 
+import re
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from openai import OpenAI
 from IPython.display import Markdown, display
@@ -12,6 +16,9 @@ load_dotenv(override=True)
 
 # Configuration
 MODEL = "gpt-4o-mini"  # OpenAI's efficient and cost-effective model
+MAX_SUMMARY_TOKENS = 500  # Length limit for the generated summary
+MAX_INPUT_TOKENS = 120_000  # Page text sent to the model, leaving room for the summary in its context window
+CHARS_PER_TOKEN = 4  # Rough ratio used to limit the text when tiktoken isn't installed
 
 # Get OpenAI API key with error checking
 api_key = os.getenv('OPENAI_API_KEY')
@@ -25,54 +32,97 @@ if not api_key:
 # Initialize OpenAI client
 openai = OpenAI(api_key=api_key)
 
+# Shared HTTP session so repeated scrapes reuse pooled connections instead of
+# opening a new TCP/TLS connection per page
+session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+session.mount('https://', _adapter)
+session.mount('http://', _adapter)
+
+# Headers to mimic a real browser, sent with every request on the session
+session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+# Runs of whitespace, collapsed to a single space in the scraped text
+WHITESPACE_RUN = re.compile(r'\s+')
+
 def scrape_website(url):
     """
     Scrape a website and extract the main text content
     """
     try:
-        # Headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        # Send a request to the website with headers
-        response = requests.get(url, headers=headers, timeout=10)
+        # Send a request to the website through the shared session
+        response = session.get(url, timeout=10)
         response.raise_for_status()
         
-        # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Parse the HTML content with the C-based lxml parser
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Remove script and style elements
         for script in soup(["script", "style"]):
             script.decompose()
         
-        # Get text content
-        text = soup.get_text()
+        # Get text content, with a space between elements so words don't run together
+        text = soup.get_text(" ")
         
         # Clean up the text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text
+        return WHITESPACE_RUN.sub(' ', text).strip()
         
     except Exception as e:
         print(f"Error scraping website: {e}")
         return None
 
-def summarize_with_openai(text, max_length=2000):
+@lru_cache(maxsize=1)
+def get_encoding():
+    """
+    Return the tiktoken encoding for MODEL, or None when tiktoken isn't installed
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # e.g. the encoding file can't be downloaded
+        print(f"Could not load the tiktoken encoding, truncating by characters: {e}")
+        return None
+
+def truncate_to_tokens(text, max_tokens=MAX_INPUT_TOKENS):
+    """
+    Truncate text to at most max_tokens tokens of MODEL's encoding
+    
+    Without tiktoken, the text is cut at roughly the same number of
+    characters (CHARS_PER_TOKEN per token) instead.
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        return text[:max_chars] + "..." if len(text) > max_chars else text
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]) + "..."
+
+def summarize_with_openai(text, max_input_tokens=MAX_INPUT_TOKENS):
     """
     Summarize text using OpenAI GPT-4o-mini
     """
     try:
-        # Truncate text if it's too long
-        if len(text) > max_length:
-            text = text[:max_length] + "..."
+        # Truncate text to the model's input budget if it's too long
+        text = truncate_to_tokens(text, max_input_tokens)
         
         # Create the prompt for summarization
         prompt = f"""Please provide a concise summary of the following text. Focus on the main points and key information:
@@ -85,7 +135,7 @@ Summary:"""
         response = openai.chat.completions.create(
             model=MODEL,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
+            max_tokens=MAX_SUMMARY_TOKENS,
             temperature=0.3
         )
         